@@ -4,6 +4,9 @@ import os, glob # Operações de arquivo
 from modules.processor import VCFProcessor # Motor de bioinformática
 from modules.visualizer import BioVisualizer # Camada visual
 from modules.reporter import ReportManager # Gestor de laudos
+from modules.cache import ParseCache # Cache persistente de parsing
+from modules.memo import RenderCache # Memoização de figuras e laudos entre reruns
+from modules.profiler import Profiler # Instrumentação opcional por etapa
 
 class GenomicApp:
     '''
@@ -12,22 +15,23 @@ class GenomicApp:
     '''
 
     def __init__(self):
-        '''Descrição: Inicializa módulos e UI. Lógica: Injeta dependências e define layout.'''
-        self.proc, self.viz, self.rep = VCFProcessor(), BioVisualizer(), ReportManager() # Injeção de dependências
+        '''
+        Descrição: Inicializa módulos e UI.
+        Lógica: Injeta dependências e define layout; cache (índice LRU), painéis e processador são montados uma vez
+                por sessão e reaproveitados a cada rerun (ex.: movimento de slider).
+        '''
+        self.prof = st.session_state.setdefault('profiler', Profiler(os.getenv('PROFILE', '0') == '1')) # Persiste entre reruns
+        if 'proc' not in st.session_state: # Primeira execução da sessão
+            cache = ParseCache(os.getenv('CACHE_DIR', './outputs/cache'), int(os.getenv('CACHE_MAX_MB', 512)) * 1024 ** 2)
+            sched = {'workers': int(os.getenv('WORKERS', 0)) or None, 'chunk_size': int(os.getenv('CHUNK_MB', 64)) * 1024 ** 2,
+                     'backend': os.getenv('BACKEND', 'auto')} # Escalonador da fase 1
+            st.session_state['proc'] = VCFProcessor(cache, profiler=self.prof, **sched) # Varre o cache uma única vez
+        self.proc, self.viz, self.rep = st.session_state['proc'], BioVisualizer(self.prof), ReportManager(self.prof) # Injeção
         st.set_page_config(page_title="MF Analyzer", layout="wide") # Configura Streamlit
 
     def _generate_sample_risk_df(self, df: pd.DataFrame, paths: list) -> pd.DataFrame:
-        '''Descrição: Gera tabela consolidada. Lógica: Identifica MAIOR_RISCO e TP53 por amostra.'''
-        rows = [] # Inicializa acumulador
-        for p in paths: # Itera sobre arquivos processados
-            sid = os.path.basename(p).split('.')[0] # Extrai ID
-            sub = df[df['SAMPLEID'] == sid] # Filtra variantes da amostra específica
-            rows.append({ # Consolida dicionário de flags
-                'SAMPLEID': sid, 'MAIOR_RISCO': 'SIM' if not sub.empty else 'NÃO',
-                'TP53_PRESENTE': 'SIM' if 'TP53' in sub['GENE'].values else 'NÃO',
-                'GENES': ', '.join(sub['GENE'].unique()), 'N_VARIANTES': len(sub)
-            })
-        return pd.DataFrame(rows) # Retorna estrutura tabular consolidada
+        '''Descrição: Gera tabela consolidada. Lógica: Delega à agregação vetorizada do VCFProcessor (MAIOR_RISCO e TP53).'''
+        return self.proc.sample_risk(df, paths) # Agregação groupby única, reindexada contra toda a coorte
 
     def run(self):
         '''Descrição: Loop de execução Streamlit. Lógica: Sidebar, Tabs e Explicações LaTeX.'''
@@ -35,49 +39,85 @@ class GenomicApp:
         p = { 'dp_min': st.sidebar.slider("DP Mínimo", 10, 200, 20), # Slider DP
               'vaf_min': st.sidebar.slider("VAF Mínimo", 0.0, 1.0, 0.05), # Slider VAF
               'max_pop_af': st.sidebar.slider("gnomAD Máximo", 0.0, 0.05, 0.01, format="%.3f") } # Slider gnomAD
+        rules = self.proc.rules # Painéis configurados (config/panels.json)
+        panel = st.sidebar.selectbox("Painel", list(rules.panels), index=list(rules.panels).index(rules.default),
+                                     format_func=lambda n: rules.panels[n].label) # Troca instantânea (fase 2)
+        unlocated = self.proc.unlocated_genes() # Genes sem coordenadas hg38 (desativam a leitura tabix/CSI)
+        if unlocated: st.sidebar.warning(f"Sem coordenadas hg38 para {', '.join(unlocated)}: leitura tabix/CSI desativada")
 
+        self.prof.enabled = st.sidebar.checkbox("Perfilamento", value=self.prof.enabled) # Instrumentação sob demanda
+        memo = st.session_state.setdefault('memo', RenderCache(int(os.getenv('RENDER_CACHE_ENTRIES', 32)))) # Memoização
         if st.sidebar.button("🚀 Iniciar Processamento"): # Trigger análise
+            memo.invalidate(); self.prof.reset(); self.proc.cache.reset_stats() # Nova coorte: descarta estado anterior
             paths = glob.glob(os.path.join(os.getenv('INPUT_DIR', './inputs'), "**/*.vcf*"), recursive=True) # Busca VCFs
+            paths = [f for f in paths if not f.endswith(('.tbi', '.csi'))] # Ignora índices tabix/CSI
             with st.spinner("Analisando coorte..."): # Feedback visual
-                st.session_state['df'] = pd.DataFrame(self.proc.run_parallel(paths, p)) # Executa motor
+                bar = st.sidebar.progress(0.0) # Andamento conforme as tarefas terminam
+                st.session_state['store'] = self.proc.build_candidates(paths, lambda n, t: bar.progress(n / t)) # Fase 1
                 st.session_state['files'] = paths # Armazena caminhos
-                st.session_state['df'].to_csv('variants_high_risk.tsv', sep='\t', index=False) # Salva TSV 1
+                st.session_state['cache_stats'] = self.proc.cache.stats() # Contadores do cache de parsing
 
-        if 'df' in st.session_state: # Verifica se há dados para exibir
-            df, files = st.session_state['df'], st.session_state['files'] # Recupera estado
-            df_risk = self._generate_sample_risk_df(df, files) # Gera tabela de risco
-            df_risk.to_csv('sample_risk.tsv', sep='\t', index=False) # Salva TSV 2
+        if 'cache_stats' in st.session_state: # Exibe a eficiência do cache da última execução
+            cs = st.session_state['cache_stats'] # Recupera contadores
+            st.sidebar.caption(f"Cache: {cs['hits']} acertos | {cs['misses']} falhas | {cs['bytes'] / 1024 ** 2:.1f} MB")
+
+        if 'store' in st.session_state: # Verifica se há dados para exibir
+            files = st.session_state['files'] # Recupera estado
+            df = self.proc.apply_thresholds(st.session_state['store'], p, panel=panel) # Fase 2: refiltragem instantânea
+            key = memo.digest(df, files) # Chave de conteúdo dos dados exibidos
+            df_risk = memo.get(('risk', key), lambda: self._generate_sample_risk_df(df, files)) # Gera tabela de risco
+            if os.getenv('EXPORT_TSV', '1') == '1' and st.session_state.get('written') != key: # TSVs opcionais, só quando os dados mudam
+                df.to_csv('variants_high_risk.tsv', sep='\t', index=False) # Salva TSV 1
+                df_risk.to_csv('sample_risk.tsv', sep='\t', index=False) # Salva TSV 2
+                st.session_state['written'] = key # Registra a versão gravada
             summary = f"ANÁLISE: {len(df_risk)} Amostras | {len(df_risk[df_risk['MAIOR_RISCO']=='SIM'])} Risco Alto | {len(df_risk[df_risk['TP53_PRESENTE']=='SIM'])} TP53 Mutado" # Resumo
             
-            tabs = st.tabs(["Geral", "OncoPrint", "Assinaturas", "Exportar PDF"]) # Cria abas
-            figs = {'gene': self.viz.plot_gene_frequency(df), 'onco': self.viz.plot_oncoprint(df), 
-                    'sign': self.viz.plot_signatures(df), 'pie': self.viz.plot_risk_pie(df, files)} # Gera gráficos
+            tabs = st.tabs(["Geral", "OncoPrint", "Assinaturas", "Exportar PDF", "Performance"]) # Cria abas
+            figs = memo.get(('figs', key), lambda: {'gene': self.viz.plot_gene_frequency(df), 'onco': self.viz.plot_oncoprint(df, len(files)),
+                    'sign': self.viz.plot_signatures(df), 'pie': self.viz.plot_risk_pie(df, files)}) # Gera gráficos
+            png = lambda k: figs[k] and memo.get(('png', key, k), lambda: self.rep.render_png(figs[k])) # PNG memoizado (tela e PDF)
+            show = lambda slot, k: figs[k] is not None and slot.image(png(k), width='stretch') # Exibe se houver dados
 
             with tabs[0]: # ABA GERAL
                 st.markdown("### Prevalência e Classificação")
                 st.write("A incidência genômica $Freq$ por gene $G_i$ na coorte de tamanho $n$ é calculada por:")
                 st.latex(r"Freq(G_i) = \sum_{j=1}^{n} \mathbb{1}_{G_i \in Sample_j}") # Fórmula LaTeX
                 st.code(summary) # Exibe resumo textual
-                cl, cr = st.columns([2, 1]); cl.pyplot(figs['gene']); cr.pyplot(figs['pie']) # Renderiza gráficos
+                cl, cr = st.columns([2, 1]); show(cl, 'gene'); show(cr, 'pie') # Renderiza gráficos
                 st.dataframe(df_risk, use_container_width=True) # Renderiza tabela
 
             with tabs[1]: # ABA ONCOPRINT
                 st.markdown("### OncoPrint: Paisagem Mutacional")
                 st.write("Representação da matriz binária de status mutacional $M_{ij}$ para o gene $i$ na amostra $j$:")
                 st.latex(r"M_{ij} = \{1 \text{ se variante presente}, 0 \text{ se selvagem}\}") # Fórmula LaTeX
-                st.pyplot(figs['onco']) # Renderiza OncoPrint
+                show(st, 'onco') # Renderiza OncoPrint
 
             with tabs[2]: # ABA ASSINATURAS
                 st.markdown("### Assinaturas de Substituição")
                 st.write("Cálculo do perfil SNV baseado na Variant Allele Frequency ($$VAF$$):")
                 st.latex(r"VAF = \frac{AD_{Alt}}{AD_{Ref} + AD_{Alt}}") # Fórmula LaTeX
-                st.pyplot(figs['sign']) # Renderiza Assinaturas
+                show(st, 'sign') # Renderiza Assinaturas
 
             with tabs[3]: # ABA EXPORTAÇÃO
                 st.markdown("### Exportação") # Markdown explicativo
                 st.info("O PDF unifica todos os gráficos e a tabela centralizada.") # Caixa de informação
                 # FIX: Inclusão do df_risk como argumento para evitar o TypeError
-                pdf_data = self.rep.create_cohort_report(p, figs, summary, df_risk) # Chama criação do PDF
+                def pdf_data(): # Gerado apenas quando o download é solicitado
+                    pngs = {k: png(k) for k in figs} # Reaproveita os PNGs já exibidos
+                    pngs['onco'] = memo.get(('onco_pages', key), lambda: self.rep.render_pages(self.viz.plot_oncoprint_pages(df, len(files))))
+                    return memo.get(('pdf', key, memo.digest(p)), lambda: self.rep.create_cohort_report(p, pngs, summary, df_risk))
                 st.download_button("Baixar Relatório", pdf_data, "MF_Report.pdf") # Botão de download
+
+            with tabs[4]: # ABA PERFORMANCE
+                st.markdown("### Performance por Etapa") # Markdown explicativo
+                if not self.prof.timers: st.info("Ative 'Perfilamento' na barra lateral e reprocesse a coorte.") # Vazio
+                else: # Medições da última execução
+                    cols = st.columns(max(1, len(self.prof.counters))) # Um indicador por contador
+                    for c, (k, v) in zip(cols, self.prof.counters.items()): c.metric(k, f"{v:,}") # Contadores
+                    st.dataframe(pd.DataFrame(self.prof.summary()), width='stretch') # Parede/CPU por etapa
+                    st.dataframe(pd.DataFrame(self.prof.per_file()), width='stretch') # Por arquivo/worker
+                    cj, ct = st.columns(2) # Exportações
+                    cj.download_button("Exportar JSON", self.prof.to_json, "mf_profile.json") # Resumo
+                    ct.download_button("Exportar Trace", self.prof.to_trace, "mf_trace.json") # Perfetto/chrome://tracing
 if __name__ == "__main__":
     GenomicApp().run() # Executa aplicação
\ No newline at end of file
@@ -0,0 +1,114 @@
+import os, glob, gzip, random # Manipulação de arquivos, compressão e sorteio reprodutível
+from itertools import takewhile # Leitura do cabeçalho até o primeiro registro
+from typing import List, Dict, Optional # Importação de tipos para tipagem estática
+from modules.processor import VCFProcessor, VCFReader, PANEL_REGIONS # Layout CSQ e coordenadas hg38 do painel
+
+BACKGROUND_GENES = ['PLEKHN1', 'TTLL10', 'DVL1', 'MXRA8', 'AURKAIP1', 'CCNL2', 'MRPL20', 'ATAD3A', 'SSU72', 'MIB2']
+CONSEQUENCES = [('missense_variant', 'MODERATE'), ('stop_gained', 'HIGH'), ('frameshift_variant', 'HIGH'),
+                ('splice_region_variant&intron_variant', 'LOW'), ('synonymous_variant', 'LOW'),
+                ('intron_variant', 'MODIFIER'), ('3_prime_UTR_variant', 'MODIFIER')] # (Consequence, IMPACT)
+FILTERS = ['weak_evidence', 'base_qual;normal_artifact', 'strand_bias', 'germline', 'clustered_events'] # Não-PASS
+BASES = 'ACGT' # Alfabeto dos alelos
+
+class SyntheticVCF:
+    '''
+    Descrição: Gerador de VCFs sintéticos anotados pelo VEP para benchmarks do VCFProcessor.
+    Lógica: Copia o cabeçalho de um VCF real (mesmo layout CSQ/FORMAT) e sorteia o corpo com semente fixa,
+            controlando volume, transcritos por linha, taxa de acerto no painel e proporção de PASS.
+    '''
+
+    def __init__(self, template: Optional[str] = None, seed: int = 0):
+        '''
+        Descrição: Carrega o cabeçalho modelo.
+        Parâmetros:
+            - template (str, opcional): VCF modelo (padrão: primeiro VCF de INPUT_DIR).
+            - seed (int): Semente do gerador pseudoaleatório.
+        Entrada: Caminho do modelo e semente.
+        Saída: Instância configurada.
+        Lógica: O layout CSQ é lido com o próprio VCFProcessor, garantindo compatibilidade com o parser.
+        '''
+        template = template or sorted(glob.glob(os.path.join(os.getenv('INPUT_DIR', './inputs'), '*.vcf*')))[0]
+        proc = VCFProcessor() # Fonte única do layout CSQ e do painel
+        self.header = list(takewhile(lambda l: l.startswith('#'), VCFReader(template).header())) # Cabeçalho modelo
+        self.fields, self.panel, self.seed = proc.get_csq_fields(template), proc.target_genes, seed # Configuração
+
+    def transcript(self, rng: random.Random, chrom: str, pos: int, gene: str) -> str:
+        '''
+        Descrição: Sorteia uma anotação CSQ de um transcrito.
+        Parâmetros:
+            - rng (random.Random): Gerador da linha.
+            - chrom (str), pos (int): Coordenadas da variante.
+            - gene (str): SYMBOL do transcrito.
+        Entrada: Gerador, coordenadas e gene.
+        Saída: str com os valores na ordem do layout CSQ do modelo.
+        Lógica: Preenche os campos usados pelo parser; os demais ficam vazios, como no VEP.
+        '''
+        cons, impact = rng.choice(CONSEQUENCES) # Consequência e severidade coerentes
+        aa = rng.randint(1, 900) # Posição na proteína
+        values = {'Location': f"{chrom}:{pos}", 'SYMBOL': gene, 'Consequence': cons, 'IMPACT': impact,
+                  'Feature': f"NM_{rng.randint(1, 999999):06d}.1", 'BIOTYPE': 'protein_coding', 'VARIANT_CLASS': 'SNV',
+                  'Protein_position': f"{aa}/{aa + rng.randint(1, 300)}", 'HGVSp': f"NP_{aa:06d}.1:p.Gly{aa}Asp",
+                  'gnomAD_AF': rng.choice(['', '', '0.0001', '0.02']), 'gnomADg_AF': rng.choice(['', '0.0001', '0.02']),
+                  'CLIN_SIG': rng.choice(['', 'pathogenic', 'likely_pathogenic', 'uncertain_significance'])} # Campos usados
+        return '|'.join(values.get(f, '') for f in self.fields) # Ordem do cabeçalho
+
+    def record(self, rng: random.Random, transcripts: int, hit_rate: float, pass_ratio: float) -> str:
+        '''
+        Descrição: Sorteia uma linha de dados do VCF.
+        Parâmetros:
+            - rng (random.Random): Gerador da linha.
+            - transcripts (int): Transcritos CSQ por linha.
+            - hit_rate (float): Probabilidade de a linha pertencer a um gene do painel.
+            - pass_ratio (float): Probabilidade de FILTER = PASS.
+        Entrada: Gerador e parâmetros de composição.
+        Saída: str com a linha completa (com quebra de linha).
+        Lógica: Linhas do painel usam coordenadas hg38 reais (válidas para tabix); as demais, genes de fundo.
+        '''
+        if rng.random() < hit_rate: # Variante em gene do painel
+            gene = rng.choice(self.panel); chrom, start, end = PANEL_REGIONS.get(gene, ('chr1', 1, 1000000)) # Região
+            pos = rng.randint(start, end) # Posição dentro do gene
+        else: gene, chrom, pos = rng.choice(BACKGROUND_GENES), f"chr{rng.randint(1, 22)}", rng.randint(1, 2 * 10 ** 8)
+        ref = rng.choice(BASES); alt = rng.choice(BASES.replace(ref, '')) # SNV
+        filt = 'PASS' if rng.random() < pass_ratio else rng.choice(FILTERS) # Status do filtro
+        csq = ','.join(self.transcript(rng, chrom, pos, gene) for _ in range(transcripts)) # Anotações VEP
+        dp = rng.randint(5, 400); alt_n = rng.randint(0, dp); af = alt_n / dp if dp else 0 # Métricas da amostra
+        info = f"DP={dp};ECNT=1;GERMQ=93;MBQ=33,30;POPAF=6.00;TLOD={rng.uniform(3, 200):.2f};CSQ={csq}" # INFO
+        tumor = f"0/1:{dp - alt_n},{alt_n}:{af:.3f}:{dp}:{alt_n // 2},{alt_n // 2}:1,1:10,10,{alt_n},0" # Amostra
+        return f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t.\t{filt}\t{info}\tGT:AD:AF:DP:F1R2:F2R1:SB\t{tumor}\t0/0:30,0:0.01:30:15,0:15,0:15,15,0,0\n"
+
+    def write(self, path: str, lines: int, transcripts: int = 3, hit_rate: float = 0.01, pass_ratio: float = 0.3,
+              compress: bool = False) -> Dict:
+        '''
+        Descrição: Grava um VCF sintético.
+        Parâmetros:
+            - path (str): Arquivo de destino (.vcf ou .vcf.gz).
+            - lines (int): Número de linhas de dados.
+            - transcripts (int): Transcritos CSQ por linha.
+            - hit_rate (float): Fração de linhas em genes do painel.
+            - pass_ratio (float): Fração de linhas com FILTER = PASS.
+            - compress (bool): Grava com gzip.
+        Entrada: Destino e parâmetros de composição.
+        Saída: Dict com caminho, linhas e bytes em disco.
+        Lógica: Semente derivada do nome do arquivo: mesmos parâmetros geram o mesmo conteúdo.
+        '''
+        rng = random.Random(f"{self.seed}:{os.path.basename(path)}") # Reprodutível por arquivo
+        with (gzip.open(path, 'wt', compresslevel=6) if compress else open(path, 'w')) as f: # Texto ou gzip
+            f.writelines(self.header) # Cabeçalho do modelo (layout CSQ real)
+            f.writelines(self.record(rng, transcripts, hit_rate, pass_ratio) for _ in range(lines)) # Corpo
+        return {'path': path, 'lines': lines, 'bytes': os.path.getsize(path)} # Descrição do arquivo gerado
+
+    def cohort(self, out_dir: str, files: int, lines: int, **kwargs) -> List[Dict]:
+        '''
+        Descrição: Gera uma coorte sintética.
+        Parâmetros:
+            - out_dir (str): Diretório de destino.
+            - files (int): Número de amostras.
+            - lines (int): Linhas por amostra.
+            - kwargs: Parâmetros repassados a write (transcripts, hit_rate, pass_ratio, compress).
+        Entrada: Diretório, tamanho da coorte e composição.
+        Saída: List[Dict] com a descrição de cada arquivo.
+        Lógica: Um VCF por amostra (SYN0000, SYN0001, ...), como na coorte real.
+        '''
+        os.makedirs(out_dir, exist_ok=True) # Garante o diretório de destino
+        ext = '.vcf.gz' if kwargs.get('compress') else '.vcf' # Extensão conforme a compressão
+        return [self.write(os.path.join(out_dir, f"SYN{i:04d}{ext}"), lines, **kwargs) for i in range(files)]
@@ -0,0 +1,195 @@
+import os, sys, glob, time, argparse # Operações de arquivo, argumentos de linha de comando e códigos de saída
+from contextlib import ExitStack # Um writer de dataset por painel
+from typing import List, Dict, Optional # Importação de tipos para tipagem estática
+from modules.processor import VCFProcessor, BACKENDS, RISK_COLUMNS # Motor de bioinformática (sem dependências de interface)
+from modules.dataset import VariantDataset # Saída Parquet particionada por amostra
+from modules.cache import ParseCache, atomic_write # Cache persistente de parsing e escrita atômica
+from modules.incremental import IncrementalCohort # Modo incremental (manifesto da coorte)
+from modules.profiler import Profiler # Instrumentação opcional por etapa
+from modules.rules import RuleSet # Painéis configuráveis
+
+EXIT_OK, EXIT_FAILURE, EXIT_USAGE, EXIT_NO_INPUT = 0, 1, 2, 3 # Códigos de saída (2 = erro de argumentos do argparse)
+
+class BatchRunner:
+    '''
+    Descrição: Execução headless da coorte (sem Streamlit) para nós de computação e agendadores.
+    Lógica: Mesmo motor do GenomicApp; Matplotlib/Seaborn e FPDF só são importados quando o PDF é solicitado.
+    '''
+
+    def __init__(self, args: argparse.Namespace, rules: RuleSet):
+        '''
+        Descrição: Inicializa o processador a partir dos argumentos.
+        Parâmetros:
+            - args (argparse.Namespace): Argumentos já validados por build_parser.
+            - rules (RuleSet): Painéis já carregados (erros de configuração tratados em main).
+        Entrada: Namespace de argumentos e painéis.
+        Saída: Instância configurada.
+        Lógica: Replica a injeção de dependências do GenomicApp (cache + escalonador).
+        '''
+        cache = None if args.no_cache else ParseCache(args.cache_dir, args.cache_max_mb * 1024 ** 2) # Cache opcional
+        self.args, self.prof = args, Profiler(bool(args.profile or args.trace)) # Configuração e instrumentação
+        self.proc = VCFProcessor(cache, workers=args.workers or None, chunk_size=args.chunk_mb * 1024 ** 2,
+                                 backend=args.backend, profiler=self.prof, rules=rules)
+
+    def log(self, msg: str):
+        '''Descrição: Mensagem de progresso. Lógica: Escreve em stderr (stdout fica livre), salvo em modo silencioso.'''
+        if not self.args.quiet: print(msg, file=sys.stderr) # Saída diagnóstica
+
+    @staticmethod
+    def _dump(path: str, text: str):
+        '''Descrição: Grava uma exportação do profiler. Lógica: Cria o diretório de destino se necessário.'''
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True) # Diretório de destino
+        with open(path, 'w') as f: f.write(text) # Conteúdo JSON
+
+    def resolve_inputs(self) -> List[str]:
+        '''
+        Descrição: Resolve a lista de VCFs da coorte.
+        Parâmetros: Nenhum (usa args.input).
+        Entrada: Diretório ou padrão glob.
+        Saída: List[str] ordenada de caminhos VCF.
+        Lógica: Diretórios são varridos recursivamente como no app; índices .tbi/.csi são ignorados.
+        '''
+        src = self.args.input # Diretório ou glob
+        pattern = os.path.join(src, "**/*.vcf*") if os.path.isdir(src) else src # Mesmo padrão do app
+        return sorted(f for f in glob.glob(pattern, recursive=True)
+                      if os.path.isfile(f) and not f.endswith(('.tbi', '.csi'))) # Apenas VCFs
+
+    def write_pdf(self, data: VariantDataset, df_risk, files: List[str], p: Dict, path: str) -> bool:
+        '''
+        Descrição: Gera o Dossiê PDF da coorte.
+        Parâmetros:
+            - data (VariantDataset): Variantes qualificadas do painel.
+            - df_risk (pd.DataFrame): Tabela de risco por amostra.
+            - files (List): Caminhos da coorte.
+            - p (Dict): Thresholds aplicados.
+            - path (str): Arquivo PDF de destino.
+        Entrada: Resultados da análise.
+        Saída: bool indicando se o PDF foi gravado (False quando não há variantes qualificadas).
+        Lógica: Imports tardios da camada visual; backend Agg (sem display) antes de carregar o pyplot; do dataset
+                são lidas apenas as colunas usadas pelos gráficos. Coorte sem variantes não tem gráficos: o laudo é
+                omitido (e um laudo anterior removido, para não divergir dos TSVs). O PDF é montado em memória e
+                publicado por atomic_write, de modo que uma falha nunca deixa um arquivo truncado.
+        '''
+        if not data.count(): # Nenhuma variante qualificada: nada a plotar
+            if os.path.exists(path): os.remove(path) # Laudo de uma execução anterior deixaria de corresponder
+            return False # Laudo omitido
+        import matplotlib; matplotlib.use('Agg') # Renderização sem servidor gráfico
+        from modules.visualizer import BioVisualizer, PLOT_COLUMNS # Camada visual (Matplotlib/Seaborn)
+        from modules.reporter import ReportManager # Gestor de laudos (FPDF)
+        viz, rep = BioVisualizer(self.prof), ReportManager(self.prof) # Instâncias sob demanda
+        df = data.read(PLOT_COLUMNS) # Leitura colunar seletiva
+        figs = {'gene': viz.plot_gene_frequency(df), 'onco': rep.render_pages(viz.plot_oncoprint_pages(df, len(files), self.args.onco_page)),
+                'sign': viz.plot_signatures(df), 'pie': viz.plot_risk_pie(df, files)} # Mesmos gráficos do app
+        summary = f"ANÁLISE: {len(df_risk)} Amostras | {len(df_risk[df_risk['MAIOR_RISCO']=='SIM'])} Risco Alto | {len(df_risk[df_risk['TP53_PRESENTE']=='SIM'])} TP53 Mutado" # Resumo
+        pdf = rep.create_cohort_report(p, figs, summary, df_risk) # Laudo completo em memória
+        with atomic_write(path) as tmp, open(tmp, 'wb') as f: f.write(pdf) # Grava e publica de forma atômica
+        return True # Laudo gravado
+
+    def run(self) -> int:
+        '''
+        Descrição: Executa a coorte completa.
+        Parâmetros: Nenhum.
+        Entrada: Argumentos da instância.
+        Saída: int com o código de saída do processo.
+        Lógica: Fases 1 e 2 em fluxo para datasets Parquet por painel (ou incremental) + agregação por amostra;
+                grava datasets, TSVs (e PDF) em args.output.
+        '''
+        args, t0 = self.args, time.perf_counter() # Configuração e cronômetro
+        files = self.resolve_inputs() # Coorte
+        if not files: # Nada a processar
+            self.log(f"Nenhum VCF encontrado em {args.input}") # Diagnóstico
+            return EXIT_NO_INPUT # Falha de entrada
+        p = {'dp_min': args.dp_min, 'vaf_min': args.vaf_min, 'max_pop_af': args.max_pop_af} # Thresholds
+        rules = self.proc.rules # Painéis compilados
+        panels = list(rules.panels) if args.panels == 'all' else (args.panels.split(',') if args.panels else [rules.default])
+        unknown = [n for n in panels if n not in rules.panels] # Nomes inválidos
+        if unknown or (args.incremental and len(panels) > 1): # Combinação não suportada
+            self.log(f"Painel desconhecido: {', '.join(unknown)}" if unknown else "--incremental aceita um único painel")
+            return EXIT_USAGE # Erro de argumentos
+        self.log(f"Processando {len(files)} VCFs...") # Progresso
+        unlocated = self.proc.unlocated_genes() # Genes sem coordenadas hg38 na configuração
+        if unlocated: self.log(f"Sem coordenadas hg38 para {', '.join(unlocated)}: leitura tabix/CSI desativada") # Aviso
+        os.makedirs(args.output, exist_ok=True) # Garante o diretório de saída
+        suffix = lambda name: '' if name == rules.default else f"_{name}" # Painel padrão mantém os nomes originais
+        datasets = {n: VariantDataset(os.path.join(args.output, f'variants_high_risk{suffix(n)}')) for n in panels}
+        with ExitStack() as stack: # Publica todos os datasets ao final (ou nenhum, em caso de falha)
+            writers = {n: stack.enter_context(d.writer({'thresholds': p, 'panel': n})) for n, d in datasets.items()}
+            if args.incremental: # Apenas VCFs novos/alterados; resultados anteriores reaproveitados
+                state_dir = args.state_dir or os.path.join(args.output, 'state') # Manifesto + variantes acumuladas
+                df, delta = IncrementalCohort(self.proc, state_dir).update(files, p, panels[0]) # Atualização incremental
+                self.log(" | ".join(f"{k}: {v}" for k, v in delta.items())) # Resumo das alterações
+                for k, (sid, g) in enumerate(df.groupby('SAMPLEID', sort=False)): writers[panels[0]].write(k, sid, g) # Por amostra
+            else: # Fases 1 e 2 em fluxo: cada VCF vira um fragmento por painel e é descartado
+                for i, hits in self.proc.stream_thresholds(files, p, panels): # Uma passagem, N painéis
+                    for n, df in hits.items(): writers[n].write(i, self.proc.sample_id(files[i]), df) # Fragmentos
+        for name, data in datasets.items(): # Saídas por painel
+            df_risk = self.proc.sample_risk(data.read(RISK_COLUMNS), files) # Agregação com leitura colunar seletiva
+            if not args.no_tsv: data.export_tsv(os.path.join(args.output, f'variants_high_risk{suffix(name)}.tsv')) # TSV 1
+            df_risk.to_csv(os.path.join(args.output, f'sample_risk{suffix(name)}.tsv'), sep='\t', index=False) # TSV 2
+            if args.pdf and name == panels[0]: # Laudo do primeiro painel solicitado
+                if not self.write_pdf(data, df_risk, files, p, os.path.join(args.output, f'MF_Report{suffix(name)}.pdf')):
+                    self.log(f"[{name}] Nenhuma variante qualificada: PDF não gerado") # Diagnóstico
+            self.log(f"[{name}] {data.count()} variantes | {int((df_risk['MAIOR_RISCO'] == 'SIM').sum())} amostras de maior risco")
+        if args.profile: self._dump(args.profile, self.prof.to_json()) # Resumo por etapa
+        if args.trace: self._dump(args.trace, self.prof.to_trace()) # Trace-event (Perfetto/chrome://tracing)
+        self.log(f"Concluído em {time.perf_counter() - t0:.2f}s") # Resumo final
+        return EXIT_OK # Sucesso
+
+def build_parser() -> argparse.ArgumentParser:
+    '''
+    Descrição: Define os argumentos da linha de comando.
+    Parâmetros: Nenhum.
+    Entrada: Nenhuma.
+    Saída: argparse.ArgumentParser configurado.
+    Lógica: Defaults vêm das mesmas variáveis de ambiente (.env) usadas pelo app.
+    '''
+    env = os.getenv # Atalho para os defaults do .env
+    ap = argparse.ArgumentParser(prog='cli.py', description="Classificação de risco MF em lote (sem interface).")
+    ap.add_argument('-i', '--input', default=env('INPUT_DIR', './inputs'), help="Diretório ou padrão glob dos VCFs")
+    ap.add_argument('-o', '--output', default=env('OUTPUT_DIR', './outputs'), help="Diretório dos datasets/TSVs/PDF")
+    ap.add_argument('--dp-min', type=int, default=int(env('DP_MIN', 20)), help="DP mínimo")
+    ap.add_argument('--vaf-min', type=float, default=float(env('VAF_MIN', 0.05)), help="VAF mínimo")
+    ap.add_argument('--max-pop-af', type=float, default=float(env('MAX_POP_AF', 0.01)), help="gnomAD máximo")
+    ap.add_argument('--panels', default=None, help="Painéis avaliados (ex.: mf_high_risk,tp53 ou all; padrão: o padrão)")
+    ap.add_argument('--panels-file', default=None, help="Configuração de painéis (padrão: PANELS_FILE)")
+    ap.add_argument('--no-tsv', action='store_true', default=env('EXPORT_TSV', '1') == '0',
+                    help="Não exporta variants_high_risk.tsv (o dataset Parquet é sempre gravado)")
+    ap.add_argument('--pdf', action='store_true', help="Gera também MF_Report.pdf (carrega Matplotlib/FPDF)")
+    ap.add_argument('--onco-page', type=int, default=int(env('ONCO_PAGE_SAMPLES', 150)),
+                    help="Amostras por página do OncoPrint no PDF (0 = página única com amostras agrupadas)")
+    ap.add_argument('--workers', type=int, default=int(env('WORKERS', 0)), help="Workers da fase 1 (0 = automático)")
+    ap.add_argument('--chunk-mb', type=int, default=int(env('CHUNK_MB', 64)), help="Tamanho das faixas de leitura")
+    ap.add_argument('--backend', choices=BACKENDS, default=env('BACKEND', 'auto'), help="Backend da fase 1")
+    ap.add_argument('--cache-dir', default=env('CACHE_DIR', './outputs/cache'), help="Diretório do cache Parquet")
+    ap.add_argument('--cache-max-mb', type=int, default=int(env('CACHE_MAX_MB', 512)), help="Limite do cache")
+    ap.add_argument('--incremental', action='store_true', help="Processa apenas VCFs novos/alterados (manifesto)")
+    ap.add_argument('--state-dir', default=None, help="Diretório do manifesto incremental (padrão: <output>/state)")
+    ap.add_argument('--no-cache', action='store_true', help="Desativa o cache de parsing")
+    ap.add_argument('--profile', default=None, help="Grava o perfil por etapa (JSON) neste arquivo")
+    ap.add_argument('--trace', default=None, help="Grava o trace-event (Perfetto/chrome://tracing) neste arquivo")
+    ap.add_argument('-q', '--quiet', action='store_true', help="Suprime mensagens de progresso")
+    return ap # Parser pronto
+
+def main(argv: Optional[List[str]] = None) -> int:
+    '''
+    Descrição: Ponto de entrada headless.
+    Parâmetros:
+        - argv (List, opcional): Argumentos (padrão: sys.argv).
+    Entrada: Linha de comando.
+    Saída: int com o código de saída (0 sucesso, 1 falha, 2 argumentos inválidos, 3 sem VCFs).
+    Lógica: Erros de processamento viram mensagem em stderr e código 1, sem traceback; configuração de painéis
+            ausente ou inválida é erro de argumentos (código 2), antes de qualquer leitura.
+    '''
+    args = build_parser().parse_args(argv) # Encerra com código 2 em argumentos inválidos
+    try: rules = RuleSet.load(args.panels_file) # Painéis solicitados (arquivo indicado precisa existir)
+    except (OSError, ValueError, KeyError) as exc: # Arquivo ausente, JSON ou painel inválido
+        print(f"Erro: {exc}", file=sys.stderr) # Diagnóstico sem traceback
+        return EXIT_USAGE # Erro de configuração
+    try: return BatchRunner(args, rules).run() # Executa a coorte
+    except KeyboardInterrupt: return 130 # Interrupção pelo usuário/agendador
+    except Exception as exc: # Falha de I/O ou de parsing
+        print(f"Erro: {exc}", file=sys.stderr) # Diagnóstico sem traceback
+        return EXIT_FAILURE # Falha de processamento
+
+if __name__ == "__main__":
+    sys.exit(main()) # Propaga o código de saída ao shell
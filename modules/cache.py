@@ -0,0 +1,159 @@
+import os, json, hashlib # Manipulação de arquivos, serialização de chaves e hashing
+import pyarrow as pa, pyarrow.parquet as pq # Tabelas colunares persistidas em Parquet
+from collections import OrderedDict # Índice LRU em memória
+from contextlib import contextmanager # Escrita atômica como bloco with
+from typing import Dict, Iterator, Optional # Importação de tipos para tipagem estática
+
+CACHE_VERSION = 2 # Versão do layout do cache (incrementar invalida todas as entradas)
+
+def file_state(path: str, hash_content: bool = False) -> Dict:
+    '''
+    Descrição: Estado de um arquivo de origem, usado para detectar alterações.
+    Parâmetros:
+        - path (str): Caminho do arquivo.
+        - hash_content (bool): Usa SHA-1 do conteúdo em vez de tamanho + mtime.
+    Entrada: Caminho e modo de comparação.
+    Saída: Dict serializável em JSON (tamanho + mtime, ou tamanho + SHA-1).
+    Lógica: Compartilhado pelo cache de parsing e pelo manifesto incremental da coorte.
+    '''
+    st = os.stat(path) # Metadados do sistema de arquivos
+    if not hash_content: return {'size': st.st_size, 'mtime': st.st_mtime_ns} # Chave barata
+    digest = hashlib.sha1() # Hash incremental do conteúdo
+    with open(path, 'rb') as f: # Lê o arquivo em blocos binários
+        for block in iter(lambda: f.read(1 << 20), b''): digest.update(block) # Atualiza o hash
+    return {'size': st.st_size, 'sha1': digest.hexdigest()} # Chave por conteúdo
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[str]:
+    '''
+    Descrição: Escrita atômica de um arquivo.
+    Parâmetros:
+        - path (str): Destino final.
+    Entrada: Caminho.
+    Saída: Context manager que entrega o caminho temporário (exclusivo do processo) a ser gravado.
+    Lógica: Sem erro, os.replace publica o temporário no destino; com erro, o temporário é removido e a exceção
+            propagada (o destino anterior fica intacto). Compartilhado por cache, modo incremental, dataset e cli.py.
+    '''
+    tmp = f"{path}.{os.getpid()}.tmp" # Temporário no mesmo diretório (mesmo sistema de arquivos para a troca)
+    try:
+        yield tmp # Chamador grava o conteúdo
+        os.replace(tmp, path) # Publica de forma atômica
+    except BaseException: # Falha na gravação (inclusive interrupção)
+        try: os.remove(tmp) # Não deixa temporário órfão
+        except FileNotFoundError: pass # Nada chegou a ser gravado
+        raise # Propaga a falha
+
+class ParseCache:
+    '''
+    Descrição: Cache persistente em disco para a tabela de candidatas de cada VCF (fase 1 do VCFProcessor).
+    Lógica: Uma entrada Parquet por arquivo, chaveada por caminho + tamanho + mtime (ou hash do conteúdo) e pelo painel,
+            com invalidação automática de entradas obsoletas e despejo LRU quando o tamanho total excede o limite.
+    '''
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 ** 2, hash_content: bool = False):
+        '''
+        Descrição: Inicializa o diretório do cache e os contadores.
+        Parâmetros:
+            - cache_dir (str): Diretório onde as entradas Parquet são gravadas.
+            - max_bytes (int): Tamanho máximo total do cache em bytes.
+            - hash_content (bool): Usa SHA-1 do conteúdo em vez de tamanho + mtime na chave.
+        Entrada: Caminho, limite e modo de chaveamento.
+        Saída: Instância configurada.
+        Lógica: Cria o diretório sob demanda, zera os contadores e varre o diretório uma única vez para montar o
+                índice em memória (entrada -> tamanho, em ordem LRU pelo mtime) usado por put/evict/stats.
+        '''
+        self.cache_dir, self.max_bytes, self.hash_content = cache_dir, max_bytes, hash_content # Configuração
+        self.hits = self.misses = self.evictions = 0 # Contadores expostos
+        os.makedirs(cache_dir, exist_ok=True) # Garante a existência do diretório
+        found = [] # Entradas existentes: (mtime, nome, tamanho)
+        for e in os.scandir(cache_dir): # Varredura única do diretório
+            if e.name.endswith('.parquet'): st = e.stat(); found.append((st.st_mtime_ns, e.name, st.st_size))
+        self._index = OrderedDict((name, size) for _, name, size in sorted(found)) # Menos recentes primeiro
+        self._versions = {} # Prefixo do arquivo de origem -> nomes das entradas
+        for name in self._index: self._versions.setdefault(self._prefix(name), set()).add(name) # Versões por arquivo
+        self._bytes = sum(self._index.values()) # Ocupação total
+
+    @staticmethod
+    def _prefix(name: str) -> str:
+        '''Descrição: Prefixo do arquivo de origem. Lógica: Parte do nome antes do hash do estado.'''
+        return name.split('-')[0] # Hash do caminho
+
+    def _track(self, name: str, size: int):
+        '''Descrição: Registra (ou renova) uma entrada no índice. Lógica: Move para o fim da ordem LRU.'''
+        self._bytes += size - self._index.pop(name, 0) # Ajusta a ocupação
+        self._index[name] = size # Mais recente
+        self._versions.setdefault(self._prefix(name), set()).add(name) # Versões do arquivo
+
+    def _drop(self, name: str):
+        '''Descrição: Remove uma entrada do disco e do índice. Lógica: Tolera remoção concorrente por outro processo.'''
+        try: os.remove(os.path.join(self.cache_dir, name)) # Remove o arquivo
+        except FileNotFoundError: pass # Já removido
+        self._bytes -= self._index.pop(name, 0) # Ajusta a ocupação
+        self._versions.get(self._prefix(name), set()).discard(name) # Esquece a versão
+
+    def _entry(self, path: str, config: Dict) -> str:
+        '''Descrição: Caminho da entrada. Lógica: <hash do caminho>-<hash do estado + painel>.parquet.'''
+        path_key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16] # Identifica o arquivo de origem
+        state = json.dumps([CACHE_VERSION, file_state(path, self.hash_content), config], sort_keys=True) # Estado completo
+        return os.path.join(self.cache_dir, f"{path_key}-{hashlib.sha1(state.encode()).hexdigest()[:16]}.parquet")
+
+    def get(self, path: str, config: Dict) -> Optional[pa.Table]:
+        '''
+        Descrição: Busca a tabela de candidatas de um VCF no cache.
+        Parâmetros:
+            - path (str): Caminho do arquivo VCF.
+            - config (Dict): Configuração que afeta o parsing (painel, consequências).
+        Entrada: Caminho e configuração.
+        Saída: pa.Table em caso de acerto, None em caso de falha.
+        Lógica: Lê o Parquet, atualiza o mtime (LRU entre execuções) e a posição no índice (LRU nesta execução).
+        '''
+        entry = self._entry(path, config) # Resolve a entrada esperada
+        try: # Entradas podem sumir entre a checagem e a leitura (despejo concorrente)
+            table = pq.read_table(entry) # Carrega a tabela colunar (dicionários preservados)
+            os.utime(entry) # Marca a entrada como usada recentemente
+        except (OSError, ValueError): # Entrada ausente ou corrompida
+            self.misses += 1 # Contabiliza a falha
+            return None # Sinaliza que o arquivo precisa ser processado
+        name = os.path.basename(entry) # Chave do índice
+        self._track(name, self._index[name] if name in self._index else os.path.getsize(entry)) # Renova (ou adota)
+        self.hits += 1 # Contabiliza o acerto
+        return table # Retorna a tabela persistida
+
+    def put(self, path: str, config: Dict, table: pa.Table):
+        '''
+        Descrição: Grava a tabela de candidatas de um VCF no cache.
+        Parâmetros:
+            - path (str): Caminho do arquivo VCF.
+            - config (Dict): Configuração que afeta o parsing.
+            - table (pa.Table): Tabela gerada pela fase 1.
+        Entrada: Caminho, configuração e tabela.
+        Saída: Nenhuma (modifica o diretório do cache).
+        Lógica: Escrita atômica, remoção das versões obsoletas do mesmo arquivo (pelo índice) e despejo LRU; custo
+                constante por chamada, sem listar o diretório.
+        '''
+        entry = self._entry(path, config) # Resolve a entrada de destino
+        name = os.path.basename(entry) # Chave do índice
+        for old in list(self._versions.get(self._prefix(name), ())): # Invalida entradas obsoletas do mesmo VCF
+            if old != name: self._drop(old) # Versão anterior (outro estado ou painel)
+        with atomic_write(entry) as tmp: pq.write_table(table, tmp) # Serializa e publica de forma atômica
+        self._track(name, os.path.getsize(entry)) # Registra no índice
+        self.evict() # Aplica o limite de tamanho
+
+    def evict(self):
+        '''Descrição: Despejo LRU. Lógica: Remove do início do índice (menos recentes) até caber em max_bytes.'''
+        while self._bytes > self.max_bytes and self._index: # Limite excedido
+            self._drop(next(iter(self._index))); self.evictions += 1 # Remove a menos recente e contabiliza
+
+    def clear(self):
+        '''Descrição: Invalidação explícita. Lógica: Remove todas as entradas do diretório e zera o índice.'''
+        for n in os.listdir(self.cache_dir): # Percorre o diretório do cache
+            if n.endswith('.parquet'): os.remove(os.path.join(self.cache_dir, n)) # Remove a entrada
+        self._index.clear(); self._versions.clear(); self._bytes = 0 # Índice vazio
+
+    def reset_stats(self):
+        '''Descrição: Zera os contadores. Lógica: Instâncias longas (sessão do app) medem cada execução separadamente.'''
+        self.hits = self.misses = self.evictions = 0 # Contadores da próxima execução
+
+    def stats(self) -> Dict:
+        '''Descrição: Contadores do cache. Lógica: Acertos, falhas, despejos e ocupação (pelo índice em memória).'''
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'bytes': self._bytes} # Resumo
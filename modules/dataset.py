@@ -0,0 +1,173 @@
+import os, json, glob, time, shutil # Manipulação de diretórios, versões e do manifesto do dataset
+from urllib.parse import quote # Nome de partição seguro (decodificado pelo particionamento hive)
+import pandas as pd # Estruturas de dados tabulares
+import pyarrow as pa # Tabelas colunares
+import pyarrow.parquet as pq # Escrita dos fragmentos Parquet
+import pyarrow.dataset as ds # Leitura colunar seletiva do dataset particionado
+from pyarrow import fs # Sistema de arquivos local com mapeamento em memória
+from typing import List, Dict, Iterator, Optional # Importação de tipos para tipagem estática
+from modules.processor import RESULT_COLUMNS, STORE_SCHEMA, CATEGORICAL # Layout das variantes qualificadas
+from modules.cache import atomic_write # Publicação atômica do manifesto
+
+PARTITION = 'SAMPLEID' # Coluna de particionamento (um diretório por amostra)
+MANIFEST = '_manifest.json' # Fragmentos na ordem da coorte + metadados da execução
+FRAGMENT_SCHEMA = pa.schema([(c, pa.string() if c in CATEGORICAL else STORE_SCHEMA.field(c).type)
+                             for c in RESULT_COLUMNS if c != PARTITION]) # Tipos fixos (colunas nulas não viram 'null')
+
+class VariantDataset:
+    '''
+    Descrição: Dataset Parquet das variantes qualificadas, particionado por amostra
+               (<versão>/SAMPLEID=<id>/part-<n>.parquet).
+    Lógica: Gravado em fluxo (um fragmento por arquivo VCF, sem reter a coorte em memória) e lido por colunas com
+            mapeamento em memória; o manifesto aponta a versão publicada e fixa a ordem dos fragmentos, igual à de
+            uma execução completa.
+    '''
+
+    def __init__(self, root: str):
+        '''Descrição: Aponta para o diretório do dataset. Lógica: Nada é lido até a primeira consulta.'''
+        self.root = root # Diretório do dataset
+
+    def writer(self, meta: Optional[Dict] = None) -> 'DatasetWriter':
+        '''Descrição: Abre uma nova versão do dataset. Lógica: Publicada por inteiro ao fechar o writer sem erro.'''
+        return DatasetWriter(self.root, meta or {}) # Escrita em diretório temporário
+
+    def manifest(self) -> Dict:
+        '''Descrição: Manifesto do dataset. Lógica: FileNotFoundError explícito quando o dataset não foi gerado.'''
+        with open(os.path.join(self.root, MANIFEST)) as f: return json.load(f) # Fragmentos e metadados
+
+    def _dataset(self) -> Optional[ds.Dataset]:
+        '''Descrição: Dataset Arrow. Lógica: Lista explícita de fragmentos (ordem da coorte); None se não há variantes.'''
+        manifest = self.manifest() # Versão publicada
+        base = os.path.join(self.root, manifest.get('version', '')) # Diretório da versão (layout antigo: a raiz)
+        files = [os.path.join(base, f) for f in manifest['files']] # Fragmentos em ordem
+        if not files: return None # Coorte sem variantes qualificadas
+        part = ds.partitioning(pa.schema([(PARTITION, pa.string())]), flavor='hive') # SAMPLEID vem do diretório
+        fmt = ds.ParquetFileFormat(read_options={'dictionary_columns': sorted(CATEGORICAL - {PARTITION})}) # Dicionários
+        return ds.dataset(files, format=fmt, partitioning=part, partition_base_dir=base,
+                          filesystem=fs.LocalFileSystem(use_mmap=True)) # Leitura mapeada em memória
+
+    def count(self) -> int:
+        '''Descrição: Número de variantes. Lógica: Soma gravada no manifesto (sem abrir os fragmentos).'''
+        return self.manifest()['rows'] # Total de linhas
+
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        '''
+        Descrição: Lê o dataset (ou apenas algumas colunas) como DataFrame.
+        Parâmetros:
+            - columns (List, opcional): Colunas desejadas (padrão: RESULT_COLUMNS).
+        Entrada: Projeção de colunas.
+        Saída: pd.DataFrame na ordem da coorte; colunas categóricas (GENE, TYPE...) chegam como category.
+        Lógica: Varredura colunar seletiva: colunas não solicitadas nunca são lidas do disco.
+        '''
+        columns, dataset = columns or RESULT_COLUMNS, self._dataset() # Projeção e fragmentos
+        if dataset is None: return pd.DataFrame(columns=columns) # Coorte sem variantes
+        return dataset.to_table(columns=columns).to_pandas() # Projeção colunar
+
+    def batches(self, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        '''Descrição: Leitura em blocos. Lógica: Um DataFrame por lote de registros, na ordem da coorte.'''
+        dataset = self._dataset() # Fragmentos da execução
+        if dataset is None: return # Nada a ler
+        for batch in dataset.to_batches(columns=columns or RESULT_COLUMNS): # Lotes na ordem dos fragmentos
+            if batch.num_rows: yield batch.to_pandas() # Bloco não vazio
+
+    def export_tsv(self, path: str, columns: Optional[List[str]] = None) -> int:
+        '''
+        Descrição: Exporta o dataset como TSV (mesmo formato de variants_high_risk.tsv).
+        Parâmetros:
+            - path (str): Arquivo de destino.
+            - columns (List, opcional): Colunas exportadas (padrão: todas).
+        Entrada: Caminho e projeção.
+        Saída: int com o número de linhas gravadas.
+        Lógica: Grava lote a lote (memória limitada a um lote); cabeçalho também em coortes sem variantes.
+        '''
+        rows, header = 0, True # Contador e controle do cabeçalho
+        with open(path, 'w', newline='') as f: # Arquivo texto
+            for df in self.batches(columns): # Lotes em ordem
+                df.to_csv(f, sep='\t', index=False, header=header); rows += len(df); header = False # Anexa o lote
+            if header: f.write('\t'.join(columns or RESULT_COLUMNS) + '\n') # Só o cabeçalho
+        return rows # Linhas exportadas
+
+class DatasetWriter:
+    '''
+    Descrição: Escrita de uma versão do VariantDataset.
+    Lógica: Fragmentos vão para um diretório de versão novo dentro do dataset; ao fechar sem erro, o manifesto
+            (ponteiro para a versão) é substituído atomicamente e as versões anteriores são removidas. O diretório do
+            dataset nunca deixa de existir e o manifesto sempre aponta uma versão completa, mesmo se o processo cair
+            no meio da escrita. Em caso de erro, a versão nova é descartada. Um writer por dataset de cada vez.
+    '''
+
+    def __init__(self, root: str, meta: Dict):
+        '''
+        Descrição: Prepara o diretório temporário.
+        Parâmetros:
+            - root (str): Diretório final do dataset.
+            - meta (Dict): Metadados da execução (thresholds, painel...).
+        Entrada: Destino e metadados.
+        Saída: Instância pronta para write().
+        Lógica: Remove sobras de escritas interrompidas e cria o diretório da nova versão (nome único e crescente).
+        '''
+        self.root, self.meta = root, meta # Destino e metadados
+        os.makedirs(root, exist_ok=True) # Dataset existe desde a primeira escrita
+        self._sweep(keep=self._published()) # Versões órfãs e sobras da troca de diretórios anterior
+        self.version = f"v{time.time_ns()}-{os.getpid()}" # Versão em construção
+        self.tmp = os.path.join(root, self.version) # Diretório da versão
+        os.makedirs(self.tmp) # Diretório limpo
+        self.files, self.rows = {}, 0 # Fragmento por índice e total de linhas
+
+    def _published(self) -> Optional[str]:
+        '''Descrição: Versão apontada pelo manifesto atual. Lógica: None sem manifesto legível ou no layout sem versões.'''
+        try: return VariantDataset(self.root).manifest().get('version') # Versão publicada
+        except (OSError, ValueError): return None # Dataset novo ou manifesto ilegível
+
+    def _sweep(self, keep: Optional[str], published: bool = False):
+        '''
+        Descrição: Remove versões que não estão publicadas.
+        Parâmetros:
+            - keep (str, opcional): Versão preservada.
+            - published (bool): True após publicar (remove também as partições do layout sem versões).
+        Entrada: Versão preservada e momento da limpeza.
+        Saída: Nenhuma (modifica o diretório do dataset).
+        Lógica: Na abertura, só versões órfãs (v*) e temporários (*.tmp) de escritas interrompidas; após publicar, tudo
+                o que não é o manifesto nem a nova versão. Sobras <dataset>.<pid>.tmp(.old) do layout anterior também saem.
+        '''
+        for e in os.scandir(self.root): # Conteúdo do dataset
+            if e.name in (MANIFEST, keep): continue # Ponteiro e versão preservada
+            if not (published or e.name.startswith('v') or e.name.endswith('.tmp')): continue # Partições antigas (ainda lidas)
+            if e.is_dir(): shutil.rmtree(e.path, ignore_errors=True) # Versão ou partição obsoleta
+            else: os.remove(e.path) # Manifesto temporário órfão
+        for leftover in glob.glob(f"{glob.escape(self.root.rstrip(os.sep))}.*.tmp*"): # Troca de diretórios interrompida
+            shutil.rmtree(leftover, ignore_errors=True) # Descarta a sobra
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self # Uso em bloco with
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: self.commit() # Publica a nova versão
+        else: shutil.rmtree(self.tmp, ignore_errors=True) # Descarta a versão parcial
+        return False # Propaga exceções
+
+    def write(self, index: int, sample: str, df: pd.DataFrame):
+        '''
+        Descrição: Grava as variantes qualificadas de um arquivo VCF.
+        Parâmetros:
+            - index (int): Posição do arquivo na coorte (define a ordem de leitura).
+            - sample (str): SAMPLEID do arquivo (partição).
+            - df (pd.DataFrame): Variantes qualificadas (RESULT_COLUMNS).
+        Entrada: Índice, amostra e variantes.
+        Saída: Nenhuma (grava um fragmento Parquet).
+        Lógica: SAMPLEID fica só no nome do diretório; arquivos sem variantes não geram fragmento.
+        '''
+        if df.empty: return # Amostra sem variantes qualificadas
+        rel = os.path.join(f"{PARTITION}={quote(sample, safe='')}", f"part-{index:06d}.parquet") # Fragmento
+        os.makedirs(os.path.join(self.tmp, os.path.dirname(rel)), exist_ok=True) # Diretório da amostra
+        table = pa.Table.from_pandas(df[FRAGMENT_SCHEMA.names], schema=FRAGMENT_SCHEMA, preserve_index=False) # Tipado
+        pq.write_table(table, os.path.join(self.tmp, rel)) # Persiste o fragmento
+        self.files[index] = rel; self.rows += len(df) # Registra
+
+    def commit(self):
+        '''Descrição: Publica a versão. Lógica: os.replace do manifesto troca a versão apontada; depois limpa as anteriores.'''
+        manifest = {'version': self.version, 'files': [self.files[i] for i in sorted(self.files)], 'rows': self.rows,
+                    'meta': self.meta} # Ponteiro para a versão + ordem dos fragmentos
+        with atomic_write(os.path.join(self.root, MANIFEST)) as tmp, open(tmp, 'w') as f: # Publicação atômica
+            json.dump(manifest, f, indent=1) # Manifesto da nova versão
+        self._sweep(keep=self.version, published=True) # Versões anteriores
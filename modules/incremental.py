@@ -0,0 +1,94 @@
+import os, json # Manipulação de arquivos e serialização do manifesto
+import pandas as pd # Estruturas de dados tabulares
+from typing import List, Dict, Tuple, Optional # Importação de tipos para tipagem estática
+from modules.cache import CACHE_VERSION, file_state, atomic_write # Versão do layout, estado dos arquivos e escrita atômica
+from modules.processor import RESULT_COLUMNS # Layout final de cada variante qualificada
+
+MANIFEST_VERSION = 1 # Versão do formato do manifesto (incrementar força reprocessamento completo)
+
+class IncrementalCohort:
+    '''
+    Descrição: Modo incremental da coorte: processa apenas VCFs novos ou alterados e mescla aos resultados existentes.
+    Lógica: Manifesto JSON (estado de cada arquivo + thresholds + painel) e tabela Parquet das variantes qualificadas,
+            com a coluna PATH indicando o arquivo de origem de cada linha.
+    '''
+
+    def __init__(self, proc, state_dir: str, hash_content: bool = False):
+        '''
+        Descrição: Inicializa o estado incremental.
+        Parâmetros:
+            - proc (VCFProcessor): Motor usado para as amostras novas ou alteradas.
+            - state_dir (str): Diretório do manifesto e da tabela de variantes.
+            - hash_content (bool): Detecta alterações pelo SHA-1 do conteúdo em vez de tamanho + mtime.
+        Entrada: Processador, diretório e modo de comparação.
+        Saída: Instância configurada.
+        Lógica: Cria o diretório sob demanda.
+        '''
+        self.proc, self.state_dir, self.hash_content = proc, state_dir, hash_content # Configuração
+        self.manifest_path = os.path.join(state_dir, 'manifest.json') # Estado dos arquivos processados
+        self.variants_path = os.path.join(state_dir, 'variants.parquet') # Variantes qualificadas acumuladas
+        os.makedirs(state_dir, exist_ok=True) # Garante a existência do diretório
+
+    def _config(self, p: Dict, panel: Optional[str] = None) -> Dict:
+        '''Descrição: Configuração que invalida todo o estado. Lógica: Versões, painéis, painel avaliado e thresholds.'''
+        return {'version': [MANIFEST_VERSION, CACHE_VERSION], 'rules': self.proc.rules.config,
+                'panel': panel or self.proc.rules.default, 'thresholds': p}
+
+    def load(self) -> Dict:
+        '''Descrição: Lê o manifesto. Lógica: Manifesto ausente ou corrompido equivale a coorte vazia.'''
+        try: # Primeira execução não tem manifesto
+            with open(self.manifest_path) as f: return json.load(f) # Estado anterior
+        except (OSError, ValueError): return {'config': None, 'files': {}} # Estado vazio
+
+    def diff(self, paths: List[str], p: Dict, panel: Optional[str] = None) -> Tuple[List[str], List[str], Dict]:
+        '''
+        Descrição: Compara a coorte atual com o manifesto.
+        Parâmetros:
+            - paths (List): Caminhos dos VCFs atuais.
+            - p (Dict): Thresholds da execução.
+            - panel (str, opcional): Painel avaliado (padrão: painel padrão).
+        Entrada: Lista de caminhos, thresholds e painel.
+        Saída: Tuple (caminhos a processar, caminhos removidos, estado atual por caminho absoluto).
+        Lógica: Configuração diferente (thresholds, painel ou versões) marca todos os arquivos como alterados.
+        '''
+        old = self.load() # Manifesto anterior
+        known = old['files'] if old['config'] == self._config(p, panel) else {} # Configuração mudou: nada é reaproveitado
+        state = {os.path.abspath(f): file_state(f, self.hash_content) for f in paths} # Estado atual
+        changed = [f for f in paths if known.get(os.path.abspath(f)) != state[os.path.abspath(f)]] # Novos/alterados
+        removed = [f for f in old['files'] if f not in state] # Saíram da coorte
+        return changed, removed, state # Plano de atualização
+
+    def update(self, paths: List[str], p: Dict, panel: Optional[str] = None) -> Tuple[pd.DataFrame, Dict]:
+        '''
+        Descrição: Atualiza os resultados da coorte processando apenas o necessário.
+        Parâmetros:
+            - paths (List): Caminhos dos VCFs atuais.
+            - p (Dict): Thresholds de filtragem.
+            - panel (str, opcional): Painel avaliado (padrão: painel padrão).
+        Entrada: Lista de caminhos, thresholds e painel.
+        Saída: Tuple (variantes qualificadas de toda a coorte, contagens {'added','changed','removed','kept'}).
+        Lógica: Descarta as linhas dos arquivos alterados/removidos, executa as fases 1 e 2 só nos alterados,
+                mescla na ordem da coorte (igual a uma execução completa) e grava variantes + manifesto.
+        '''
+        old_files = self.load()['files'] # Para distinguir arquivos novos de alterados
+        changed, removed, state = self.diff(paths, p, panel) # Plano de atualização
+        prev = None # Variantes da execução anterior
+        if len(changed) < len(paths): # Há resultados a reaproveitar
+            try: prev = pd.read_parquet(self.variants_path) # Variantes acumuladas
+            except (OSError, ValueError): changed = list(paths) # Estado inconsistente: reprocessa tudo
+        store = self.proc.build_candidates(changed) # Fase 1 apenas nos alterados
+        new = self.proc.apply_thresholds(store, p, ['FILE'] + RESULT_COLUMNS, panel) # Fase 2 com o arquivo de origem
+        new.insert(0, 'PATH', [os.path.abspath(changed[i]) for i in new.pop('FILE')]) # Índice -> caminho absoluto
+        stale = {os.path.abspath(f) for f in changed} | set(removed) # Linhas que deixam de valer
+        df = pd.concat([prev[~prev['PATH'].isin(stale)], new], ignore_index=True) if prev is not None else new # Mescla
+        order = {f: i for i, f in enumerate(state)} # Ordem da coorte atual
+        df = df.iloc[df['PATH'].map(order).argsort(kind='stable')].reset_index(drop=True) # Ordem de execução completa
+        self._write(df, {'config': self._config(p, panel), 'files': state}) # Persiste o novo estado
+        added = sum(os.path.abspath(f) not in old_files for f in changed) # Arquivos inéditos
+        return df.drop(columns='PATH'), {'added': added, 'changed': len(changed) - added, 'removed': len(removed),
+                                         'kept': len(paths) - len(changed)} # Resultado e resumo
+
+    def _write(self, df: pd.DataFrame, manifest: Dict):
+        '''Descrição: Persiste o estado. Lógica: Escrita atômica; variantes antes do manifesto (falha = reprocessar).'''
+        with atomic_write(self.variants_path) as tmp: df.to_parquet(tmp, index=False) # Publica as variantes
+        with atomic_write(self.manifest_path) as tmp, open(tmp, 'w') as f: json.dump(manifest, f, indent=1) # Manifesto
@@ -0,0 +1,81 @@
+import hashlib, threading # Hash de conteúdo e exclusão mútua (downloads rodam em outra thread)
+import pandas as pd # Hash vetorizado de DataFrames
+from collections import OrderedDict # Ordem de uso para a política LRU
+from typing import Any, Callable, Hashable # Importação de tipos para tipagem estática
+
+class RenderCache:
+    '''
+    Descrição: Memoização de figuras, buffers PNG e bytes de PDF entre reruns do Streamlit.
+    Lógica: Entradas chaveadas pelo conteúdo dos dados, limitadas por número (LRU); figuras despejadas são fechadas.
+    '''
+
+    def __init__(self, max_entries: int = 32):
+        '''
+        Descrição: Inicializa o cache vazio.
+        Parâmetros:
+            - max_entries (int): Número máximo de entradas mantidas em memória.
+        Entrada: Limite de entradas.
+        Saída: Instância configurada.
+        Lógica: OrderedDict mantém da menos para a mais recentemente usada.
+        '''
+        self.max_entries, self._items, self._lock = max_entries, OrderedDict(), threading.Lock() # Estado
+        self.hits = self.misses = 0 # Contadores expostos
+
+    @staticmethod
+    def digest(*parts: Any) -> str:
+        '''
+        Descrição: Chave de conteúdo para DataFrames e valores simples.
+        Parâmetros:
+            - parts (Any): DataFrames, listas, dicionários ou escalares.
+        Entrada: Objetos que determinam o resultado memoizado.
+        Saída: str com o SHA-1 do conteúdo.
+        Lógica: DataFrames usam hash_pandas_object (vetorizado); demais objetos usam repr.
+        '''
+        h = hashlib.sha1() # Hash incremental
+        for part in parts: # Itera sobre os componentes da chave
+            if isinstance(part, pd.DataFrame): # Conteúdo tabular: colunas + hash por linha
+                h.update(repr(list(part.columns)).encode()) # Layout das colunas
+                h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes()) # Valores
+            else: h.update(repr(sorted(part.items()) if isinstance(part, dict) else part).encode()) # Valor simples
+        return h.hexdigest() # Chave final
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        '''
+        Descrição: Retorna o valor memoizado ou o constrói.
+        Parâmetros:
+            - key (Hashable): Chave da entrada (ex.: ('figs', digest)).
+            - factory (Callable): Função sem argumentos que gera o valor.
+        Entrada: Chave e construtor.
+        Saída: Valor memoizado.
+        Lógica: Acerto move a entrada para o fim da fila LRU; falha constrói, insere e despeja o excedente.
+        '''
+        with self._lock: # Leitura protegida
+            if key in self._items: # Acerto
+                self._items.move_to_end(key); self.hits += 1 # Marca como recente
+                return self._items[key] # Retorna sem recomputar
+        value = factory() # Constrói fora do lock (renderização pode ser lenta)
+        with self._lock: # Escrita protegida
+            self.misses += 1; self._items[key] = value # Registra a nova entrada
+            while len(self._items) > self.max_entries: self._release(self._items.popitem(last=False)[1]) # LRU
+        return value # Retorna o valor construído
+
+    def invalidate(self, kind: Hashable = None):
+        '''
+        Descrição: Invalidação explícita (ex.: nova coorte processada).
+        Parâmetros:
+            - kind (Hashable, opcional): Remove apenas chaves cujo primeiro elemento seja kind; None remove tudo.
+        Entrada: Tipo de entrada ou None.
+        Saída: Nenhuma (modifica o cache).
+        Lógica: Libera os recursos das entradas removidas.
+        '''
+        with self._lock: # Remoção protegida
+            for key in [k for k in self._items if kind is None or (isinstance(k, tuple) and k[0] == kind)]:
+                self._release(self._items.pop(key)) # Remove e libera
+
+    @staticmethod
+    def _release(value: Any):
+        '''Descrição: Libera recursos. Lógica: Fecha figuras Matplotlib (inclusive dentro de dicionários).'''
+        for v in (value.values() if isinstance(value, dict) else [value]): # Valor simples ou dicionário de figuras
+            if hasattr(v, 'savefig'): # Figura Matplotlib
+                import matplotlib.pyplot as plt # Import tardio: o cache não depende de plotagem
+                plt.close(v) # Remove a figura do gerenciador do pyplot
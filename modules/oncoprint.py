@@ -0,0 +1,97 @@
+import numpy as np # Matriz de códigos inteiros e ordenação vetorizada
+import pandas as pd # Fatoração das colunas categóricas
+from typing import List, Iterator, Optional # Importação de tipos para tipagem estática
+
+class OncoMatrix:
+    '''
+    Descrição: Matriz gene x amostra do OncoPrint em códigos inteiros (0 = selvagem, k = k-ésimo tipo de consequência).
+    Lógica: Construída por fatoração (sem pivot de strings nem operações célula a célula); a ordenação por exclusividade
+            mútua, o agrupamento de colunas e a paginação operam apenas sobre o array uint8.
+    '''
+
+    def __init__(self, codes: np.ndarray, genes: List[str], samples: List[str], types: List[str], bin_size: int = 1):
+        '''
+        Descrição: Inicializa a matriz.
+        Parâmetros:
+            - codes (np.ndarray): Array uint8 (genes x amostras) de códigos de tipo.
+            - genes (List): Rótulos das linhas.
+            - samples (List): Rótulos das colunas.
+            - types (List): Tipos de consequência (código k -> types[k - 1]).
+            - bin_size (int): Amostras representadas por coluna (1 = sem agrupamento).
+        Entrada: Códigos e rótulos.
+        Saída: Instância.
+        Lógica: Estrutura imutável; as transformações devolvem novas instâncias.
+        '''
+        self.codes, self.genes, self.samples, self.types, self.bin_size = codes, genes, samples, types, bin_size # Estado
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'OncoMatrix':
+        '''
+        Descrição: Monta a matriz a partir das variantes qualificadas.
+        Parâmetros:
+            - df (pd.DataFrame): Variantes com GENE, SAMPLEID e TYPE.
+        Entrada: DataFrame.
+        Saída: OncoMatrix (genes e amostras na ordem de primeira ocorrência).
+        Lógica: factorize das três colunas e uma atribuição vetorizada; em genes com várias variantes na mesma amostra
+                vale a primeira (mesma regra do aggfunc='first' anterior), garantida por drop_duplicates antes da atribuição.
+        '''
+        df = df.drop_duplicates(['GENE', 'SAMPLEID'], keep='first') # Um código por célula (ordem de atribuição irrelevante)
+        g, genes = pd.factorize(df['GENE'], sort=False) # Linha de cada variante
+        s, samples = pd.factorize(df['SAMPLEID'], sort=False) # Coluna de cada variante
+        t, types = pd.factorize(df['TYPE'], sort=True) # Tipo de cada variante (ordem alfabética estável)
+        codes = np.zeros((len(genes), len(samples)), dtype=np.uint8) # Tudo selvagem
+        codes[g, s] = t + 1 # Atribuição vetorizada (índices únicos)
+        return cls(codes, [str(x) for x in genes], [str(x) for x in samples], [str(x) for x in types]) # Matriz
+
+    def sort(self) -> 'OncoMatrix':
+        '''
+        Descrição: Ordenação por exclusividade mútua (estilo memo sort do cBioPortal).
+        Parâmetros: Nenhum.
+        Entrada: Matriz da instância.
+        Saída: Nova OncoMatrix ordenada.
+        Lógica: Genes por frequência decrescente; amostras pelo vetor binário de mutação lido como número (gene mais
+                frequente = dígito mais significativo), o que forma blocos em escada e evidencia a exclusividade.
+        '''
+        hit = self.codes > 0 # Status binário
+        rows = np.argsort(-hit.sum(axis=1), kind='stable') # Genes mais mutados no topo
+        hit = hit[rows] # Linhas reordenadas
+        cols = np.lexsort(~hit[::-1]) if len(hit) else np.arange(hit.shape[1]) # Última chave (gene do topo) é a primária
+        return OncoMatrix(self.codes[rows][:, cols], [self.genes[i] for i in rows], [self.samples[j] for j in cols],
+                          self.types, self.bin_size) # Matriz ordenada
+
+    def downsample(self, max_cols: int) -> 'OncoMatrix':
+        '''
+        Descrição: Reduz o número de colunas agrupando amostras adjacentes.
+        Parâmetros:
+            - max_cols (int): Limite de colunas.
+        Entrada: Limite.
+        Saída: OncoMatrix com no máximo max_cols colunas (a própria instância se já couber).
+        Lógica: Após sort(), vizinhas têm perfis semelhantes; cada grupo exibe o maior código (gene mutado em alguma
+                amostra do grupo), preservando os blocos visuais.
+        '''
+        n = len(self.samples) # Colunas atuais
+        if not max_cols or n <= max_cols: return self # Já cabe
+        size = -(-n // max_cols) # Amostras por coluna (arredondado para cima)
+        pad = np.zeros((len(self.genes), -n % size), dtype=np.uint8) # Completa o último grupo
+        codes = np.hstack([self.codes, pad]).reshape(len(self.genes), -1, size).max(axis=2) # Máximo por grupo
+        labels = [self.samples[j] for j in range(0, n, size)] # Primeira amostra de cada grupo
+        return OncoMatrix(codes, self.genes, labels, self.types, size * self.bin_size) # Matriz reduzida
+
+    def pages(self, per_page: int) -> Iterator['OncoMatrix']:
+        '''Descrição: Fatias de colunas consecutivas. Lógica: Mantém ordem e rótulos; per_page <= 0 devolve a matriz inteira.'''
+        n = len(self.samples) # Colunas
+        step = per_page if per_page and per_page > 0 else max(n, 1) # Tamanho da página
+        for lo in range(0, max(n, 1), step): # Uma página por fatia
+            yield OncoMatrix(self.codes[:, lo:lo + step], self.genes, self.samples[lo:lo + step], self.types, self.bin_size)
+
+    def frequencies(self, cohort_size: Optional[int] = None) -> np.ndarray:
+        '''
+        Descrição: Frequência de cada gene na coorte.
+        Parâmetros:
+            - cohort_size (int, opcional): Amostras da coorte, inclusive as selvagens (padrão: colunas da matriz).
+        Entrada: Tamanho da coorte.
+        Saída: np.ndarray com a fração de amostras mutadas por gene.
+        Lógica: A matriz só tem colunas para amostras com variante; o denominador deve ser a coorte inteira.
+        '''
+        total = max(cohort_size or self.codes.shape[1], 1) # Denominador (evita divisão por zero)
+        return (self.codes > 0).sum(axis=1) / total # Amostras mutadas / coorte
@@ -1,6 +1,245 @@
-import os, re, glob # Importação de bibliotecas para manipulação de arquivos e expressões regulares
-from typing import List, Dict, Tuple # Importação de tipos para tipagem estática
-from concurrent.futures import ProcessPoolExecutor # Importação para processamento paralelo em múltiplos núcleos
+import os, re, glob, time # Importação de bibliotecas para manipulação de arquivos, expressões regulares e relógio
+import gzip, zlib, struct, mmap # Leitura de VCFs (texto, gzip/bgzip) e de índices tabix/CSI
+import numpy as np # Vetores numéricos das colunas
+import pandas as pd # Estruturas colunares para o repositório de candidatas
+import pyarrow as pa # Tabelas colunares compactas trocadas entre processos
+import pyarrow.compute as pc # Máscaras da fase 2 sobre a tabela Arrow de um único arquivo
+from typing import List, Dict, Tuple, Iterator, Optional, Callable # Importação de tipos para tipagem estática
+from itertools import islice # Janela inicial de tarefas do pool
+from collections import Counter # Faixas pendentes por arquivo
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED # Backends de paralelismo
+from modules.profiler import Profiler, profiled # Instrumentação opcional por etapa
+from modules.rules import RuleSet # Painéis configuráveis compilados
+
+RESULT_COLUMNS = ['SAMPLEID', 'CHROM', 'POS', 'REF', 'ALT', 'GENE', 'VAF', 'DP', 'TYPE', 'SUB',
+                  'PROT_POS', 'HGVSp', 'CLIN', 'IMPACT'] # Layout final de cada variante qualificada
+STORE_COLUMNS = ['FILE', 'LINE'] + RESULT_COLUMNS + ['POP_AF', 'CONS_MASK'] # Layout do repositório colunar
+RISK_COLUMNS = ['SAMPLEID', 'GENE'] # Colunas lidas pela agregação por amostra (leitura colunar seletiva)
+CATEGORICAL = {'SAMPLEID', 'CHROM', 'GENE', 'TYPE', 'SUB', 'CLIN', 'IMPACT'} # Colunas com dicionário (códigos inteiros)
+STORE_SCHEMA = pa.schema([(c, pa.dictionary(pa.int32(), pa.string()) if c in CATEGORICAL else t) for c, t in [
+    ('LINE', pa.int64()), ('SAMPLEID', None), ('CHROM', None), ('POS', pa.string()), ('REF', pa.string()),
+    ('ALT', pa.string()), ('GENE', None), ('VAF', pa.float64()), ('DP', pa.int64()), ('TYPE', None), ('SUB', None),
+    ('PROT_POS', pa.int64()), ('HGVSp', pa.string()), ('CLIN', None), ('IMPACT', None), ('POP_AF', pa.float64()),
+    ('CONS_MASK', pa.uint32())]]) # Tipos da tabela de cada arquivo (STORE_COLUMNS sem FILE)
+PANEL_REGIONS = { # Coordenadas hg38 (1-based, inclusivas) dos genes do painel MF
+    'TP53': ('chr17', 7661779, 7687538), 'EZH2': ('chr7', 148807383, 148884321),
+    'CBL': ('chr11', 119206290, 119313926), 'U2AF1': ('chr21', 43092956, 43107570),
+    'SRSF2': ('chr17', 76734115, 76737374), 'IDH1': ('chr2', 208236227, 208266074),
+    'IDH2': ('chr15', 90083045, 90102477), 'NRAS': ('chr1', 114704469, 114716771),
+    'KRAS': ('chr12', 25205246, 25250936) }
+BODY_START = re.compile(rb'^[^#]', re.M) # Primeira linha de dados após o cabeçalho
+BACKENDS = ('auto', 'serial', 'thread', 'process') # Backends de execução do escalonador
+REGION_PAD = 5000 # Janela upstream/downstream padrão do VEP (variantes vizinhas também recebem o SYMBOL)
+
+class TabixIndex:
+    '''
+    Descrição: Leitor mínimo de índices tabix (.tbi) e CSI (.csi) para VCFs comprimidos com bgzip.
+    Lógica: Decodifica o esquema de bins (R-tree) e devolve os intervalos de offsets virtuais BGZF de uma região.
+    '''
+
+    def __init__(self, index_path: str):
+        '''
+        Descrição: Carrega o índice em memória.
+        Parâmetros:
+            - index_path (str): Caminho do arquivo .tbi ou .csi.
+        Entrada: String contendo o caminho do índice.
+        Saída: Instância com nomes de sequências, bins e índice linear.
+        Lógica: O índice é um BGZF (gzip multi-membro); os campos seguem a especificação SAMtools.
+        '''
+        with gzip.open(index_path, 'rb') as f: data = f.read() # Descomprime o índice inteiro
+        self.min_shift, self.depth, csi = 14, 5, data[:4] == b'CSI\1' # Parâmetros fixos do formato TBI
+        if csi: # Formato CSI: parâmetros explícitos e cabeçalho tabix no campo aux
+            self.min_shift, self.depth, l_aux = struct.unpack_from('<3i', data, 4) # Lê parâmetros
+            aux, pos = data[16:16 + l_aux], 16 + l_aux # Isola o campo auxiliar
+            names = aux[28:].split(b'\0') if len(aux) >= 28 else [] # Nomes das sequências (se presentes)
+            n_ref, = struct.unpack_from('<i', data, pos); pos += 4 # Número de sequências
+        elif data[:4] == b'TBI\1': # Formato TBI clássico
+            n_ref, = struct.unpack_from('<i', data, 4) # Número de sequências
+            l_nm, = struct.unpack_from('<i', data, 32) # Tamanho do bloco de nomes
+            names, pos = data[36:36 + l_nm].split(b'\0'), 36 + l_nm # Nomes das sequências
+        else: raise ValueError(f"Índice inválido: {index_path}") # Arquivo não reconhecido
+        self.refs = {} # Mapa nome -> (bins, índice linear)
+        for i in range(n_ref): # Itera sobre as sequências de referência
+            bins, n_bin = {}, struct.unpack_from('<i', data, pos)[0]; pos += 4 # Número de bins
+            for _ in range(n_bin): # Itera sobre os bins da sequência
+                b, = struct.unpack_from('<I', data, pos); pos += 4 # Identificador do bin
+                if csi: pos += 8 # CSI: ignora o loffset do bin
+                n_chunk, = struct.unpack_from('<i', data, pos); pos += 4 # Número de chunks do bin
+                bins[b] = struct.unpack_from(f'<{2 * n_chunk}Q', data, pos); pos += 16 * n_chunk # Pares (beg, end)
+            linear = () # Índice linear (apenas TBI)
+            if not csi: # O TBI carrega offsets mínimos por janela de 16 kb
+                n_intv, = struct.unpack_from('<i', data, pos); pos += 4 # Número de janelas
+                linear = struct.unpack_from(f'<{n_intv}Q', data, pos); pos += 8 * n_intv # Offsets mínimos
+            name = names[i].decode() if i < len(names) else str(i) # Nome da sequência
+            self.refs[name] = (bins, linear) # Registra a sequência
+
+    def _reg2bins(self, beg: int, end: int) -> List[int]:
+        '''Descrição: Bins que podem conter [beg, end). Lógica: Algoritmo reg2bins genérico (min_shift/depth).'''
+        end, bins, t, s = end - 1, [], 0, self.min_shift + self.depth * 3 # Inicializa nível raiz
+        for level in range(self.depth + 1): # Percorre do nível raiz até as folhas
+            bins.extend(range(t + (beg >> s), t + (end >> s) + 1)) # Bins sobrepostos neste nível
+            t, s = t + (1 << (level * 3)), s - 3 # Avança para o próximo nível
+        return bins # Lista de bins candidatos
+
+    def chunks(self, chrom: str, start: int, end: int) -> List[Tuple[int, int]]:
+        '''
+        Descrição: Intervalos BGZF que cobrem uma região.
+        Parâmetros:
+            - chrom (str): Nome da sequência (aceita com ou sem prefixo 'chr').
+            - start (int): Início 1-based inclusivo.
+            - end (int): Fim 1-based inclusivo.
+        Entrada: Coordenadas da região.
+        Saída: List[Tuple] de offsets virtuais (início, fim).
+        Lógica: Une os chunks dos bins sobrepostos, descartando os anteriores ao índice linear.
+        '''
+        alt = chrom[3:] if chrom.startswith('chr') else 'chr' + chrom # Convenção alternativa de nomes
+        bins, linear = self.refs.get(chrom) or self.refs.get(alt) or ({}, ()) # Sequência no índice
+        min_off = linear[min((start - 1) >> 14, len(linear) - 1)] if linear else 0 # Offset mínimo útil
+        out = [] # Acumulador de chunks
+        for b in self._reg2bins(start - 1, end): # Itera sobre os bins candidatos
+            c = bins.get(b, ()) # Chunks do bin
+            out.extend((c[i], c[i + 1]) for i in range(0, len(c), 2) if c[i + 1] > min_off) # Filtra pelo linear
+        return out # Retorna chunks (não ordenados)
+
+class VCFReader:
+    '''
+    Descrição: Camada de leitura de VCFs em streaming (texto, gzip ou bgzip) com acesso aleatório por região.
+    Lógica: Sem índice, percorre o arquivo linha a linha; com .tbi/.csi, salta direto para as regiões pedidas.
+    '''
+
+    def __init__(self, path: str):
+        '''Descrição: Inicializa o leitor. Lógica: Detecta compressão pelo magic number e procura o índice.'''
+        self.path = path # Caminho do VCF
+        with open(path, 'rb') as f: self.gzipped = f.read(2) == b'\x1f\x8b' # gzip e bgzip compartilham o magic
+        cands = [path + '.tbi', path + '.csi'] # Convenções de nome dos índices
+        self.index_path = next((c for c in cands if self.gzipped and os.path.exists(c)), None) # Índice disponível
+
+    def open(self):
+        '''Descrição: Abre o VCF em modo binário. Lógica: gzip.open descomprime bgzip (gzip multi-membro) em streaming.'''
+        if self.gzipped: return gzip.open(self.path, 'rb') # VCF comprimido
+        return open(self.path, 'rb') # VCF em texto plano
+
+    def blocks(self, regions: Optional[List[Tuple[str, int, int]]] = None, size: int = 1 << 22,
+               span: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[bytes, int, int, int]]:
+        '''
+        Descrição: Lê o VCF em janelas de linhas completas, numa única passagem sobre o arquivo.
+        Parâmetros:
+            - regions (List, opcional): Tuplas (cromossomo, início, fim) 1-based.
+            - size (int): Tamanho aproximado de cada bloco descomprimido em bytes.
+            - span (Tuple, opcional): Faixa de bytes [início, fim) do corpo (apenas texto plano), alinhada a linhas.
+        Entrada: Regiões de interesse ou None para o arquivo inteiro.
+        Saída: Iterator de (buffer, início, fim, offset); a primeira janela é sempre o cabeçalho, as demais só dados;
+               offset é a posição de buffer[início] no fluxo lido (identifica a linha no arquivo).
+        Lógica: Texto plano é mapeado em memória (sem cópias); gzip/bgzip é descomprimido em blocos;
+                com índice, o corpo vem apenas dos chunks das regiões.
+        '''
+        indexed = regions is not None and self.index_path is not None # Define o modo de leitura
+        if not self.gzipped: # Texto plano: mmap evita ler e copiar o arquivo
+            with open(self.path, 'rb') as f: # Abre o VCF
+                if os.fstat(f.fileno()).st_size == 0: yield b'', 0, 0, 0; return # Arquivo vazio
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: # Mapeia o arquivo
+                    m = BODY_START.search(mm) # Primeira linha que não começa com '#'
+                    cut = m.start() if m else len(mm) # Fronteira cabeçalho/corpo
+                    yield mm, 0, cut, 0 # Janela do cabeçalho
+                    lo, hi = (cut, len(mm)) if span is None else (self._align(mm, span[0]), self._align(mm, span[1]))
+                    lo = max(lo, cut) # O corpo nunca inclui o cabeçalho
+                    if lo < hi: yield mm, lo, hi, lo # Janela do corpo (inteiro ou da faixa)
+            return # Leitura encerrada
+        with self.open() as f: # VCF comprimido: descompressão em streaming
+            data, carry, m = b'', b'', None # Bloco atual, linha incompleta e fronteira do cabeçalho
+            while m is None: # Garante que o bloco cubra o cabeçalho inteiro
+                more = f.read(size) # Próximo bloco descomprimido
+                if not more: break # Fim do arquivo
+                data += more; m = BODY_START.search(data) # Procura a primeira linha de dados
+            cut, offset = m.start() if m else len(data), 0 # Fronteira cabeçalho/corpo e posição no fluxo
+            yield data, 0, cut, 0 # Janela do cabeçalho
+            if indexed: data = b'' # Com índice, o corpo vem das regiões
+            while not indexed: # Varredura completa do corpo
+                end = data.rfind(b'\n', cut) + 1 # Fim da última linha completa
+                if end > cut: yield data, cut, end, offset + cut # Janela com linhas completas
+                carry, data = data[max(end, cut):], f.read(size) # Guarda a linha incompleta
+                offset += max(end, cut) # Bytes do fluxo já entregues ou descartados
+                if not data: break # Fim do arquivo
+                data, cut = carry + data, 0 # Reúne a linha incompleta ao próximo bloco
+            if carry and not data: yield carry, 0, len(carry), offset # Última linha sem quebra
+        if not indexed: return # Varredura completa encerrada
+        idx = TabixIndex(self.index_path) # Carrega o índice
+        chunks = sorted(c for r in regions for c in idx.chunks(*r)) # Reúne os chunks de todas as regiões
+        merged = [] # Chunks sobrepostos unidos (cada registro lido uma única vez)
+        for beg, end in chunks: # Percorre em ordem de offset
+            if merged and beg <= merged[-1][1]: merged[-1][1] = max(merged[-1][1], end) # Une sobreposição
+            else: merged.append([beg, end]) # Novo intervalo
+        norm = [(c.removeprefix('chr').encode(), s, e) for c, s, e in regions] # Cromossomos sem prefixo 'chr'
+        with open(self.path, 'rb') as fh: # Acesso aleatório ao arquivo comprimido
+            offset = 0 # Posição acumulada das janelas entregues (única por linha)
+            for beg, end in merged: # Percorre os intervalos
+                keep = [] # Linhas do intervalo que sobrepõem alguma região
+                for line in self._read_chunk(fh, beg, end): # Linhas iniciadas no intervalo
+                    cols = line.split(b'\t', 5) # Apenas CHROM, POS e REF são necessários aqui
+                    if line[:1] == b'#' or len(cols) < 5: continue # Ignora cabeçalho e linhas truncadas
+                    chrom, pos = cols[0].removeprefix(b'chr'), int(cols[1]) # Cromossomo normalizado e posição
+                    stop = pos + len(cols[3]) - 1 # Última base ocupada pela variante
+                    if any(chrom == c and pos <= e and stop >= s for c, s, e in norm): keep.append(line) # Sobrepõe
+                if not keep: continue # Intervalo sem variantes nas regiões
+                block = b''.join(keep); yield block, 0, len(block), offset # Janela com as linhas da região
+                offset += len(block) # Avança a posição acumulada
+
+    @staticmethod
+    def _align(mm, pos: int) -> int:
+        '''Descrição: Alinha uma fronteira de faixa. Lógica: Avança até o início da próxima linha (ou fim do arquivo).'''
+        if pos <= 0: return 0 # Início do arquivo já é início de linha
+        nl = mm.find(b'\n', pos - 1) # Quebra de linha na fronteira ou depois dela
+        return len(mm) if nl < 0 else nl + 1 # Início da linha seguinte
+
+    def lines(self, regions: Optional[List[Tuple[str, int, int]]] = None) -> Iterator[bytes]:
+        '''Descrição: Cabeçalho seguido das linhas de dados. Lógica: Quebra as janelas de blocks() em linhas brutas.'''
+        for buf, lo, hi, _ in self.blocks(regions): yield from buf[lo:hi].splitlines(keepends=True) # Linha a linha
+
+    def header(self) -> Iterator[str]:
+        '''Descrição: Linhas de metadados. Lógica: Decodifica apenas a primeira janela de blocks().'''
+        blocks = self.blocks() # Mantém o gerador (e o mmap) aberto durante a leitura da janela
+        buf, lo, hi, _ = next(blocks, (b'', 0, 0, 0)) # Janela do cabeçalho
+        text = buf[lo:hi].decode('utf-8'); blocks.close() # Copia o cabeçalho e libera o arquivo
+        yield from text.splitlines(keepends=True) # Devolve as linhas de metadados
+
+    def records(self, regions: Optional[List[Tuple[str, int, int]]] = None) -> Iterator[str]:
+        '''Descrição: Linhas de dados decodificadas. Lógica: Filtra o cabeçalho de lines().'''
+        for line in self.lines(regions): # Cabeçalho + corpo
+            if line[:1] != b'#': yield line.decode('utf-8') # Ignora metadados
+
+    @staticmethod
+    def _read_block(fh, coffset: int) -> Tuple[bytes, int]:
+        '''Descrição: Lê um bloco BGZF. Lógica: BSIZE no subcampo extra 'BC'; retorna dados e tamanho comprimido.'''
+        fh.seek(coffset) # Posiciona no início do bloco
+        head = fh.read(12) # Cabeçalho gzip fixo
+        if len(head) < 12: return b'', 0 # Fim do arquivo
+        xlen, = struct.unpack('<H', head[10:12]) # Tamanho do campo extra
+        extra, bsize, i = fh.read(xlen), None, 0 # Subcampos do extra
+        while i + 4 <= xlen: # Percorre os subcampos (SI1, SI2, SLEN, dados)
+            slen, = struct.unpack_from('<H', extra, i + 2) # Tamanho do subcampo
+            if extra[i:i + 2] == b'BC': bsize, = struct.unpack_from('<H', extra, i + 4) # Tamanho total - 1
+            i += 4 + slen # Próximo subcampo
+        if bsize is None: raise ValueError("Arquivo gzip sem blocos BGZF: use bgzip para indexar") # Não é BGZF
+        cdata = fh.read(bsize + 1 - 12 - xlen) # Dados comprimidos + CRC32 + ISIZE
+        return zlib.decompress(cdata[:-8], -15), bsize + 1 # Descomprime o deflate bruto
+
+    def _read_chunk(self, fh, beg: int, end: int) -> Iterator[bytes]:
+        '''Descrição: Linhas iniciadas em [beg, end). Lógica: Descomprime blocos até cobrir o fim do chunk.'''
+        coff, buf, limit = beg >> 16, bytearray(), None # Estado da leitura
+        while True: # Lê blocos até cobrir o chunk e completar a última linha
+            if limit is None and coff >= end >> 16: # Alcançou o bloco final do chunk
+                limit = len(buf) + ((end & 0xFFFF) if coff == end >> 16 else 0) # Fim do chunk no buffer
+            if limit is not None and buf.find(b'\n', max(limit - 1, 0)) >= 0: break # Última linha completa
+            data, size = self._read_block(fh, coff) # Descomprime o próximo bloco
+            if not size: break # Fim do arquivo
+            buf += data; coff += size # Acumula dados e avança
+        limit = len(buf) if limit is None else min(limit, len(buf)) # Chunk até o fim do arquivo
+        pos = beg & 0xFFFF # Offset inicial dentro do primeiro bloco
+        while pos < limit: # Linhas que começam antes do fim do chunk
+            nl = buf.find(b'\n', pos) # Fim da linha atual
+            nl = len(buf) - 1 if nl < 0 else nl # Última linha sem quebra
+            yield bytes(buf[pos:nl + 1]) # Devolve a linha completa
+            pos = nl + 1 # Avança para a próxima linha
 
 class VCFProcessor:
     '''
@@ -8,16 +247,27 @@ class VCFProcessor:
     Lógica: Executa parsing paralelo de VCFs, extração de anotações CSQ e validação de risco biológico.
     '''
 
-    def __init__(self):
+    def __init__(self, cache=None, workers: Optional[int] = None, chunk_size: int = 64 * 1024 ** 2,
+                 backend: str = 'auto', profiler: Optional[Profiler] = None, rules: Optional[RuleSet] = None):
         '''
-        Descrição: Inicializa o painel de genes e termos de consequência biológica.
-        Parâmetros: Nenhum.
-        Entrada: Nenhuma.
+        Descrição: Inicializa o painel de genes, os termos de consequência biológica e o escalonador.
+        Parâmetros:
+            - cache (ParseCache, opcional): Cache persistente da fase 1 (modules.cache).
+            - workers (int, opcional): Número de workers (padrão: núcleos lógicos).
+            - chunk_size (int): Tamanho máximo em bytes de cada faixa de um VCF em texto plano.
+            - backend (str): 'serial', 'thread', 'process' ou 'auto' (serial para uma única tarefa).
+            - profiler (Profiler, opcional): Instrumentação por etapa (padrão: desligada).
+            - rules (RuleSet, opcional): Painéis compilados (padrão: RuleSet.load(), ou seja, config/panels.json).
+        Entrada: Configuração opcional de cache, paralelismo e painéis.
         Saída: Instância da classe configurada.
-        Lógica: Define listas estáticas baseadas no consenso médico para Mielofibrose.
+        Lógica: Genes e termos da fase 1 são a união de todos os painéis configurados (uma única passagem).
         '''
-        self.target_genes = ['TP53', 'EZH2', 'CBL', 'U2AF1', 'SRSF2', 'IDH1', 'IDH2', 'NRAS', 'KRAS'] # Painel de genes MF
-        self.target_cons = ['missense_variant', 'stop_gained', 'frameshift_variant', 'splice_', 'start_lost'] # Consequências alvo
+        if backend not in BACKENDS: raise ValueError(f"Backend inválido: {backend} (use {', '.join(BACKENDS)})")
+        self.cache = cache # Cache em disco das tabelas de candidatas (None desativa)
+        self.profiler = profiler or Profiler() # Desligado por padrão (pontos de medição viram no-ops)
+        self.workers, self.chunk_size, self.backend = workers or os.cpu_count() or 1, chunk_size, backend # Escalonador
+        self.rules = rules or RuleSet.load() # Painéis compilados uma única vez
+        self.target_genes, self.target_cons = self.rules.genes, self.rules.cons # União de genes e termos dos painéis
 
     def get_csq_fields(self, vcf_path: str) -> List[str]:
         '''
@@ -28,13 +278,40 @@ class VCFProcessor:
         Saída: List[str] contendo os nomes das colunas da anotação (ex: SYMBOL, IMPACT).
         Lógica: Varre o header procurando por 'ID=CSQ' e extrai o formato via Regex para garantir o mapeamento correto.
         '''
-        with open(vcf_path, 'r') as f: # Abre o arquivo VCF em modo leitura
-            for line in f: # Itera sobre cada linha do arquivo
-                if 'ID=CSQ' in line and 'Format:' in line: # Identifica a linha de metadado do CSQ
-                    match = re.search(r'Format: (.*)\"', line) # Busca o padrão do formato entre aspas
-                    return match.group(1).split('|') if match else [] # Divide os campos pelo caractere pipe
+        for line in VCFReader(vcf_path).header(): # Itera sobre o cabeçalho (texto, gzip ou bgzip)
+            fields = self.parse_csq_header(line) # Tenta interpretar a linha como metadado CSQ
+            if fields is not None: return fields # Primeira linha CSQ define o layout
         return [] # Retorna lista vazia caso não encontre a anotação CSQ no header
 
+    def parse_csq_header(self, line: str) -> Optional[List[str]]:
+        '''
+        Descrição: Extrai os campos CSQ de uma linha de cabeçalho.
+        Parâmetros:
+            - line (str): Linha de metadados do VCF.
+        Entrada: String da linha.
+        Saída: List[str] com os campos, [] se o formato for ilegível, ou None se a linha não for do CSQ.
+        Lógica: Mesma regra de get_csq_fields, reutilizável durante a leitura em passagem única.
+        '''
+        if 'ID=CSQ' not in line or 'Format:' not in line: return None # Não é a linha de metadado do CSQ
+        match = re.search(r'Format: (.*)\"', line) # Busca o padrão do formato entre aspas
+        return match.group(1).split('|') if match else [] # Divide os campos pelo caractere pipe
+
+    def unlocated_genes(self) -> List[str]:
+        '''Descrição: Genes sem coordenadas hg38. Lógica: Ausentes de PANEL_REGIONS e do campo 'regions' da configuração.'''
+        return [g for g in self.target_genes if g not in PANEL_REGIONS and g not in self.rules.regions] # Sem região
+
+    def panel_regions(self) -> Optional[List[Tuple[str, int, int]]]:
+        '''
+        Descrição: Regiões hg38 do painel para leitura por índice tabix/CSI.
+        Parâmetros: Nenhum.
+        Entrada: Painel de genes da instância.
+        Saída: List[Tuple] (cromossomo, início, fim) ou None se algum gene não tiver coordenadas (ver unlocated_genes).
+        Lógica: Expande cada gene pela janela do VEP para manter variantes upstream/downstream anotadas.
+        '''
+        if self.unlocated_genes(): return None # A fase 1 extrai a união: um gene sem região exige varredura completa
+        regions = {**PANEL_REGIONS, **self.rules.regions} # Coordenadas embutidas + definidas na configuração
+        return [(c, max(1, s - REGION_PAD), e + REGION_PAD) for c, s, e in (regions[g] for g in self.target_genes)]
+
     def calc_vaf(self, metrics: Dict) -> float:
         '''
         Descrição: Calcula a frequência alélica da variante ($$VAF$$).
@@ -74,14 +351,12 @@ class VCFProcessor:
             - p (Dict): Parâmetros de thresholds (DP_min, VAF_min, gnomAD).
         Entrada: Dados da variante e dicionário de limites.
         Saída: bool indicando aprovação ou rejeição da variante.
-        Lógica: Aplica lógica booleana AND/OR conforme as regras de negócio de Mielofibrose.
+        Lógica: Regra biológica do painel padrão (conjuntos e matcher pré-compilados) AND regras técnicas.
         '''
         pop_af = float(ann.get('gnomAD_AF') or 0) # Captura frequência populacional (0 se N/A)
-        gene_ok = ann.get('SYMBOL') in self.target_genes # Verifica presença no painel MF
-        impact_ok = ann.get('IMPACT') in ['HIGH', 'MODERATE'] # Verifica severidade do impacto
-        cons_ok = any(c in ann.get('Consequence', '') for c in self.target_cons) # Verifica termos funcionais
+        bio_ok = self.rules.panel().accepts(ann.get('SYMBOL'), ann.get('IMPACT'), ann.get('Consequence', '')) # Painel
         metric_ok = (dp >= p['dp_min'] or vaf >= p['vaf_min']) # Aplica regra de qualidade técnica dinâmica
-        return gene_ok and (impact_ok or cons_ok) and metric_ok and pop_af <= p['max_pop_af'] # Filtro final
+        return bio_ok and metric_ok and pop_af <= p['max_pop_af'] # Filtro final
 
     def parse_line(self, line: str, fields: List, p: Dict, sid: str) -> List[Dict]:
         '''
@@ -112,6 +387,342 @@ class VCFProcessor:
                           'HGVSp': ann.get('HGVSp', 'N/A'), 'CLIN': ann.get('CLIN_SIG', 'N/A'), 'IMPACT': ann.get('IMPACT') }]
         return [] # Retorna lista vazia caso nenhum transcrito passe na validação
 
+    def scan_context(self, fields: List[str]) -> Dict:
+        '''
+        Descrição: Pré-computa o estado de leitura de um arquivo a partir do layout CSQ.
+        Parâmetros:
+            - fields (List): Lista de nomes dos campos CSQ.
+        Entrada: Campos do cabeçalho.
+        Saída: Dict com índices dos campos, painel em frozenset, filtro binário e cache de FORMAT.
+        Lógica: Resolve tudo uma única vez por arquivo para que o laço por linha não crie dicionários.
+        '''
+        pos = {f: i for i, f in enumerate(fields)} # Nome -> índice (último vence, como em dict(zip))
+        keys = ['SYMBOL', 'Consequence', 'IMPACT', 'gnomAD_AF', 'Protein_position', 'HGVSp', 'CLIN_SIG'] # Usados
+        genes = b'|'.join(re.escape(g.encode()) for g in self.target_genes) # Símbolos do painel em bytes
+        lead = rb'\|' if pos.get('SYMBOL', 0) > 0 else rb'[=,]' # Delimitador antes do SYMBOL
+        tail = rb'\|' if pos.get('SYMBOL', 0) < len(fields) - 1 else rb'(?:[,;\t\r\n]|$)' # Delimitador depois
+        gate = lead + b'(?:' + genes + b')' + tail # Prefixo literal acelera a busca do motor de regex
+        return {'idx': tuple(pos.get(k, 1 << 30) for k in keys), # Campo ausente -> índice inalcançável
+                'genes': self.rules.gene_set, 'gate': re.compile(gate), 'fmt': {}} # Estado do arquivo
+
+    def sample_metrics(self, cols: List[str], fmt_cache: Dict) -> Tuple[int, float]:
+        '''
+        Descrição: Extrai DP e VAF da coluna SAMPLE.
+        Parâmetros:
+            - cols (List): Colunas da linha do VCF.
+            - fmt_cache (Dict): Cache FORMAT -> posições de DP/AF/AD do arquivo.
+        Entrada: Colunas e cache.
+        Saída: Tuple (DP, VAF).
+        Lógica: Resolve as posições uma vez por string FORMAT distinta e monta apenas as chaves usadas.
+        '''
+        keys = fmt_cache.get(cols[8]) # Posições já conhecidas para este FORMAT
+        if keys is None: # Primeira ocorrência deste FORMAT no arquivo
+            keys = fmt_cache[cols[8]] = {k: i for i, k in enumerate(cols[8].split(':')) if k in ('DP', 'AF', 'AD')}
+        vals = cols[9].split(':') # Extrai os valores do campo SAMPLE
+        metrics = {k: vals[i] for k, i in keys.items() if i < len(vals)} # Mesmo resultado de dict(zip(...))
+        return int(metrics.get('DP', 0)), self.calc_vaf(metrics) # Obtém profundidade e calcula VAF
+
+    def extract_candidates(self, line: str, ctx: Dict, sid: str, idx: int) -> List[Tuple]:
+        '''
+        Descrição: Fase 1 do motor: extrai todos os transcritos do painel de uma linha, sem aplicar thresholds.
+        Parâmetros:
+            - line (str): Linha bruta do arquivo de dados.
+            - ctx (Dict): Estado do arquivo gerado por scan_context.
+            - sid (str): Identificador da amostra.
+            - idx (int): Índice da linha no arquivo (agrupa transcritos da mesma variante).
+        Entrada: String da linha, estado pré-computado e posição.
+        Saída: List[Tuple] com uma tupla por transcrito de gene do painel (ordem de STORE_COLUMNS, sem FILE).
+        Lógica: Mesmo resultado de parse_line, acessando os campos CSQ por índice e guardando gnomAD e a máscara.
+        '''
+        cols = line.strip().split('\t', 10) # Divide apenas as colunas fixas + primeira amostra
+        if cols[6] != 'PASS' or 'CSQ=' not in cols[7]: return [] # Ignora variantes sem PASS ou sem CSQ
+        i_sym, i_cons, i_imp, i_af, i_pos, i_hgvs, i_clin = ctx['idx'] # Índices resolvidos no cabeçalho
+        rows, metrics = [], None # Acumulador e métricas (calculadas sob demanda)
+        for transcript in cols[7].split('CSQ=')[1].split(';')[0].split(','): # Transcritos anotados pelo VEP
+            t = transcript.split('|'); n = len(t) # Valores do transcrito
+            gene = t[i_sym] if i_sym < n else None # SYMBOL do transcrito
+            if gene not in ctx['genes']: continue # Mantém apenas genes do painel
+            if metrics is None: # Primeiro transcrito do painel: lê a amostra uma única vez
+                metrics = self.sample_metrics(cols, ctx['fmt']) + (self.get_sub_type(cols[3], cols[4]),) # DP, VAF, SUB
+            cons = t[i_cons] if i_cons < n else '' # Termos de consequência do transcrito
+            mask = self.rules.cons_mask(cons) # Bitmask de termos funcionais (memoizada por Consequence)
+            p_pos = (t[i_pos] if i_pos < n else '').split('/')[0] # Extrai posição da proteína
+            rows.append((idx, sid, cols[0], cols[1], cols[3], cols[4], gene, metrics[1], metrics[0], cons.split('&')[0],
+                         metrics[2], int(p_pos) if p_pos.isdigit() else 0, t[i_hgvs] if i_hgvs < n else 'N/A',
+                         t[i_clin] if i_clin < n else 'N/A', t[i_imp] if i_imp < n else None,
+                         float((t[i_af] if i_af < n else None) or 0), mask)) # Tupla colunar do transcrito
+        return rows # Retorna os candidatos da linha
+
+    def process_file_candidates(self, path: str, span: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+        '''
+        Descrição: Worker da fase 1: converte um VCF (ou uma faixa dele) em tabela colunar de transcritos candidatos.
+        Parâmetros:
+            - path (str): Caminho do arquivo VCF.
+            - span (Tuple, opcional): Faixa de bytes [início, fim) a processar (VCF em texto plano).
+        Entrada: String contendo o caminho do arquivo.
+        Saída: pa.Table no layout de STORE_SCHEMA; LINE é o offset da linha no arquivo.
+        Lógica: Uma passagem (cabeçalho + corpo); cada bloco é varrido em bytes atrás de PASS e do símbolo
+                do painel, e só essas linhas são decodificadas e divididas.
+        '''
+        with self.profiler.span('phase1.file', file=path, span=span): return self._scan_file(path, span) # Medido
+
+    def _scan_file(self, path: str, span: Optional[Tuple[int, int]]) -> pa.Table:
+        '''Descrição: Corpo de process_file_candidates. Lógica: Varredura em bytes com contadores opcionais.'''
+        prof = self.profiler # Instrumentação (no-op quando desligada)
+        blocks = prof.timed_iter('phase1.io', VCFReader(path).blocks(self.panel_regions(), span=span)) # Janelas
+        extract = prof.timed('phase1.extract', self.extract_candidates) # Decodificação + CSQ (medida se ligada)
+        rows, sid, passed, hits = [], os.path.basename(path).split('.')[0], 0, 0 # Setup e contadores locais
+        buf, lo, hi, _ = next(blocks, (b'', 0, 0, 0)) # Primeira janela: cabeçalho completo
+        header = buf[lo:hi].decode('utf-8') # Decodifica apenas o cabeçalho
+        fields = next((f for f in map(self.parse_csq_header, header.splitlines()) if f is not None), []) # Layout CSQ
+        if not fields: return self.to_table(rows) # Arquivo sem CSQ
+        ctx = self.scan_context(fields) # Estado pré-computado do arquivo
+        for buf, lo, hi, base in blocks: # Percorre o corpo em janelas de linhas completas
+            if prof.enabled: prof.count('lines_read', buf[lo:hi].count(b'\n')) # Contagem em C, só se ligada
+            pos, find, gate = lo, buf.find, ctx['gate'].search # Cursor e buscas em C sobre bytes brutos
+            while True: # Salta direto de uma linha PASS para a próxima
+                i = find(b'\tPASS\t', pos, hi) # FILTER = PASS (coluna anterior ao INFO/CSQ)
+                if i < 0: break # Nenhuma linha PASS no restante da janela
+                end = find(b'\n', i, hi) # Fim da linha encontrada
+                end = hi if end < 0 else end # Última linha sem quebra
+                passed += 1 # Linha PASS
+                if gate(buf, i, end): # Símbolo do painel no INFO/CSQ, sem split nem decodificação
+                    start = buf.rfind(b'\n', lo, i) + 1 or lo # Início da linha encontrada
+                    rows.extend(extract(buf[start:end].decode('utf-8'), ctx, sid, base + start - lo)); hits += 1
+                pos = end + 1 # Continua após a linha
+        prof.count('pass_lines', passed); prof.count('panel_lines', hits); prof.count('candidates', len(rows)) # Totais
+        return self.to_table(rows) # Monta a tabela colunar do arquivo
+
+    def to_table(self, rows: List[Tuple]) -> pa.Table:
+        '''
+        Descrição: Converte as tuplas de candidatos numa tabela Arrow compacta.
+        Parâmetros:
+            - rows (List): Tuplas geradas por extract_candidates.
+        Entrada: Lista de tuplas na ordem de STORE_SCHEMA.
+        Saída: pa.Table com colunas tipadas e categóricas codificadas em dicionário.
+        Lógica: Uma coluna por campo (sem dicionário por linha); serializa como buffers contíguos entre processos.
+        '''
+        cols = list(zip(*rows)) if rows else [()] * len(STORE_SCHEMA) # Transpõe linhas em colunas
+        arrays = [pa.array(c, pa.string()).dictionary_encode() if f.name in CATEGORICAL else pa.array(c, f.type)
+                  for f, c in zip(STORE_SCHEMA, cols)] # Vetores tipados
+        return pa.Table.from_arrays(arrays, schema=STORE_SCHEMA) # Tabela do arquivo ou faixa
+
+    def parse_config(self) -> Dict:
+        '''Descrição: Configuração que altera a fase 1. Lógica: Painel e consequências (chave de cache e de manifesto).'''
+        return {'genes': self.target_genes, 'cons': self.target_cons} # Serializável em JSON
+
+    def plan_tasks(self, paths: List[str]) -> List[Tuple[int, int, str, Optional[Tuple[int, int]]]]:
+        '''
+        Descrição: Divide a coorte em tarefas balanceadas.
+        Parâmetros:
+            - paths (List): Lista de caminhos físicos dos arquivos.
+        Entrada: Lista de strings.
+        Saída: List[Tuple] (tamanho, índice do arquivo, caminho, faixa), da maior para a menor tarefa.
+        Lógica: VCFs em texto plano maiores que chunk_size viram faixas de bytes (alinhadas a linhas pelo leitor);
+                arquivos comprimidos seguem inteiros. Maiores primeiro evita que um arquivo grande termine sozinho.
+        '''
+        tasks = [] # Acumulador de tarefas
+        for i, path in enumerate(paths): # Itera sobre os arquivos da coorte
+            size = os.path.getsize(path) # Tamanho em disco
+            if VCFReader(path).gzipped or size <= self.chunk_size: tasks.append((size, i, path, None)) # Inteiro
+            else: tasks.extend((min(self.chunk_size, size - s), i, path, (s, s + self.chunk_size))
+                               for s in range(0, size, self.chunk_size)) # Faixas do arquivo
+        return sorted(tasks, key=lambda t: -t[0]) # Maiores primeiro (ordenação estável)
+
+    def iter_candidates(self, tasks: List[Tuple]) -> Iterator[Tuple[int, Optional[Tuple[int, int]], pa.Table]]:
+        '''
+        Descrição: Executa as tarefas da fase 1 no backend configurado.
+        Parâmetros:
+            - tasks (List): Tarefas geradas por plan_tasks.
+        Entrada: Lista de tarefas.
+        Saída: Iterator de (índice do arquivo, faixa, tabela), na ordem em que as tarefas terminam.
+        Lógica: O backend de processos recebe só (caminho, faixa) e usa um VCFProcessor criado uma vez por worker;
+                no máximo 2 x workers tarefas ficam em voo, limitando os resultados retidos no processo pai. O horário
+                de chegada de cada resultado (callback do future) mede o IPC sem incluir o trabalho do consumidor.
+        '''
+        backend = self.backend # Backend solicitado
+        if backend == 'auto': backend = 'serial' if len(tasks) <= 1 or self.workers <= 1 else 'process' # Evita spawn
+        if backend == 'serial': # Execução no próprio processo
+            for _, i, path, span in tasks: yield i, span, self.process_file_candidates(path, span) # Tarefa a tarefa
+            return # Execução serial encerrada
+        if backend == 'thread': # Threads compartilham a instância (útil para I/O e gzip)
+            executor, fn = ThreadPoolExecutor(self.workers), self.process_file_candidates # Pool de threads
+        else: # Processos recebem apenas a configuração do painel, uma vez por worker
+            executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                           initargs=(self.rules.config, self.profiler.enabled)) # Painéis serializáveis
+            fn = _candidates_task # Função de módulo (não serializa a instância a cada tarefa)
+        queue, running, arrived = iter(tasks), {}, {} # Tarefas a submeter, futures em execução e horário de chegada
+        def submit(task): # Submete uma tarefa e registra quando o resultado chega ao processo pai
+            fut = executor.submit(fn, task[2], task[3]); running[fut] = (task[1], task[3]) # Índice e faixa
+            if self.profiler.enabled: fut.add_done_callback(lambda f: arrived.__setitem__(f, time.time())) # Recebimento
+        with executor: # Garante o encerramento do pool
+            for task in islice(queue, 2 * self.workers): submit(task) # Janela inicial
+            while running: # Janela limitada: resultados não consumidos não se acumulam no processo pai
+                done, _ = wait(running, return_when=FIRST_COMPLETED) # Próximas tarefas concluídas
+                for fut in done: # Entrega conforme termina
+                    key, result = running.pop(fut), fut.result() # Tabela (threads) ou (tabela, medições) (processos)
+                    if backend == 'process': self.profiler.merge(result[1], arrived.pop(fut, None)); result = result[0] # Medições
+                    nxt = next(queue, None) # Repõe a janela (maiores primeiro)
+                    if nxt: submit(nxt) # Submete a próxima
+                    yield key + (result,) # Índice, faixa e tabela
+
+    def iter_files(self, paths: List[str], progress: Optional[Callable[[int, int], None]] = None
+                   ) -> Iterator[Tuple[int, pa.Table]]:
+        '''
+        Descrição: Fase 1 arquivo a arquivo: entrega a tabela de candidatos de cada VCF assim que fica completa.
+        Parâmetros:
+            - paths (List): Lista de caminhos físicos dos arquivos.
+            - progress (Callable, opcional): Recebe (tarefas concluídas, total) a cada resultado.
+        Entrada: Lista de strings.
+        Saída: Iterator de (índice do arquivo, pa.Table no layout de STORE_SCHEMA), acertos de cache primeiro.
+        Lógica: Consulta o cache, escalona apenas as falhas e remonta cada arquivo a partir das suas faixas; o chamador
+                decide se acumula (build_candidates) ou descarta cada tabela após o uso (stream_thresholds).
+        '''
+        config, todo = self.parse_config(), [] # Parâmetros que alteram a fase 1 e arquivos sem cache
+        for i, f in enumerate(paths): # Acertos são entregues sem reter a coorte em memória
+            with self.profiler.span('phase1.cache_get', file=f): part = self.cache.get(f, config) if self.cache else None
+            if part is None: todo.append(i) # Exige leitura do VCF
+            else: yield i, part # Tabela persistida
+        tasks = [(size, todo[j], path, span) for size, j, path, span in self.plan_tasks([paths[i] for i in todo])]
+        pending = Counter(t[1] for t in tasks) # Faixas restantes por arquivo (uma passagem sobre as tarefas)
+        chunks = {i: [] for i in todo} # Faixas concluídas por arquivo
+        for n, (i, span, part) in enumerate(self.iter_candidates(tasks), 1): # Resultados conforme terminam
+            chunks[i].append(((span or (0, 0))[0], part)); pending[i] -= 1 # Guarda a faixa
+            if progress: progress(n, len(tasks)) # Notifica o andamento
+            if pending[i]: continue # Arquivo ainda incompleto
+            table = pa.concat_tables([p for _, p in sorted(chunks.pop(i), key=lambda c: c[0])]) # Faixas em ordem
+            if self.cache: self.cache.put(paths[i], config, table) # Persiste para execuções futuras
+            yield i, table # Arquivo completo
+
+    @profiled('phase1.build_candidates')
+    def build_candidates(self, paths: List[str], progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        '''
+        Descrição: Fase 1 para a coorte: faz o parsing de todos os VCFs uma única vez.
+        Parâmetros:
+            - paths (List): Lista de caminhos físicos dos arquivos.
+            - progress (Callable, opcional): Recebe (tarefas concluídas, total) a cada resultado.
+        Entrada: Lista de strings.
+        Saída: pd.DataFrame colunar com todos os transcritos do painel da coorte.
+        Lógica: Reúne as tabelas de iter_files e converte para pandas uma única vez (dicionários Arrow viram
+                colunas category).
+        '''
+        parts = [None] * len(paths) # Tabela de cada arquivo, na ordem da coorte
+        for i, table in self.iter_files(paths, progress): parts[i] = table # Acumula a coorte inteira
+        with self.profiler.span('phase1.to_pandas', rows=sum(p.num_rows for p in parts)): # Montagem do DataFrame
+            table = pa.concat_tables(parts) if parts else STORE_SCHEMA.empty_table() # Concatenação sem cópia
+            files = np.repeat(np.arange(len(parts), dtype=np.int32), [p.num_rows for p in parts]) # Arquivo de origem
+            return table.add_column(0, 'FILE', pa.array(files, pa.int32())).to_pandas() # Repositório pronto
+
+    @profiled('phase2.apply_thresholds')
+    def apply_thresholds(self, store: pd.DataFrame, p: Dict, columns: List[str] = RESULT_COLUMNS,
+                         panel: Optional[str] = None) -> pd.DataFrame:
+        '''
+        Descrição: Fase 2 do motor: aplica os thresholds como máscaras booleanas vetorizadas.
+        Parâmetros:
+            - store (pd.DataFrame): Repositório gerado por build_candidates.
+            - p (Dict): Parâmetros de thresholds (DP_min, VAF_min, gnomAD).
+            - columns (List): Colunas de saída (ex.: incluir 'FILE' para rastrear o arquivo de origem).
+            - panel (str, opcional): Painel avaliado (padrão: painel padrão da configuração).
+        Entrada: Tabela colunar e dicionário de limites.
+        Saída: pd.DataFrame com as colunas solicitadas (padrão: RESULT_COLUMNS).
+        Lógica: Máscaras do painel (genes, impacto, termos) + regras técnicas; mantém o primeiro transcrito aprovado por linha.
+        '''
+        rule = self.rules.panel(panel) # Painel compilado
+        gene_ok = rule.genes >= self.rules.gene_set or store['GENE'].isin(list(rule.genes)).to_numpy() # Genes do painel
+        impact_ok = store['IMPACT'].isin(list(rule.impacts)).to_numpy() # Verifica severidade do impacto
+        cons_ok = (store['CONS_MASK'].to_numpy() & rule.cons_bits) != 0 # Termos funcionais do painel
+        metric_ok = (store['DP'] >= p['dp_min']).to_numpy() | (store['VAF'] >= p['vaf_min']).to_numpy() # Qualidade
+        mask = gene_ok & (impact_ok | cons_ok) & metric_ok & (store['POP_AF'] <= p['max_pop_af']).to_numpy() # Filtro final
+        hits = store[mask].drop_duplicates(['FILE', 'LINE'], keep='first') # Primeiro transcrito aprovado por linha
+        hits = hits[columns].reset_index(drop=True) # Descarta colunas auxiliares
+        for c in CATEGORICAL & set(columns): hits[c] = hits[c].astype(object) # Restaura tipos de saída
+        self.profiler.count('variants_kept', len(hits)) # Variantes qualificadas
+        return hits # Retorna as variantes qualificadas
+
+    @profiled('phase2.filter_table')
+    def filter_table(self, table: pa.Table, p: Dict, panel: Optional[str] = None) -> pa.Table:
+        '''
+        Descrição: Fase 2 sobre a tabela Arrow de um único arquivo (caminho rápido de process_file_worker).
+        Parâmetros:
+            - table (pa.Table): Tabela de process_file_candidates (STORE_SCHEMA, sem FILE).
+            - p (Dict): Parâmetros de thresholds (DP_min, VAF_min, gnomAD).
+            - panel (str, opcional): Painel avaliado (padrão: painel padrão da configuração).
+        Entrada: Tabela colunar e dicionário de limites.
+        Saída: pa.Table com RESULT_COLUMNS (mesmas linhas de apply_thresholds).
+        Lógica: Mesmas máscaras de apply_thresholds em pyarrow.compute, sem DataFrame categórico por arquivo; os
+                transcritos de uma linha são contíguos, então o primeiro aprovado é o que difere do LINE anterior.
+        '''
+        rule = self.rules.panel(panel) # Painel compilado
+        mask = pc.and_(pc.or_(pc.greater_equal(table['DP'], p['dp_min']), pc.greater_equal(table['VAF'], p['vaf_min'])),
+                       pc.less_equal(table['POP_AF'], p['max_pop_af'])) # Regras técnicas
+        cons_ok = pc.not_equal(pc.bit_wise_and(table['CONS_MASK'], pa.scalar(rule.cons_bits, pa.uint32())), 0) # Termos
+        mask = pc.and_(mask, pc.or_(pc.is_in(table['IMPACT'], pa.array(list(rule.impacts), pa.string())), cons_ok))
+        if not rule.genes >= self.rules.gene_set: # Painel com parte dos genes extraídos
+            mask = pc.and_(mask, pc.is_in(table['GENE'], pa.array(list(rule.genes), pa.string()))) # Genes do painel
+        hits = table.filter(mask) # Transcritos aprovados
+        line = hits['LINE'].to_numpy() # Linha de origem de cada transcrito
+        hits = hits.filter(np.r_[True, line[1:] != line[:-1]] if len(line) else line.astype(bool)) # Primeiro por linha
+        self.profiler.count('variants_kept', hits.num_rows) # Variantes qualificadas
+        return hits.select(RESULT_COLUMNS) # Layout final
+
+    def apply_panels(self, store: pd.DataFrame, p: Dict, panels: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        '''
+        Descrição: Avalia vários painéis sobre o mesmo repositório (uma única passagem pelos VCFs).
+        Parâmetros:
+            - store (pd.DataFrame): Repositório gerado por build_candidates.
+            - p (Dict): Parâmetros de thresholds.
+            - panels (List, opcional): Nomes dos painéis (padrão: todos os configurados).
+        Entrada: Tabela colunar, limites e painéis.
+        Saída: Dict painel -> variantes qualificadas.
+        Lógica: Cada painel custa apenas as máscaras vetorizadas da fase 2.
+        '''
+        return {name: self.apply_thresholds(store, p, panel=name) for name in panels or self.rules.panels} # Por painel
+
+    def stream_thresholds(self, paths: List[str], p: Dict, panels: Optional[List[str]] = None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[int, Dict[str, pd.DataFrame]]]:
+        '''
+        Descrição: Fases 1 e 2 em fluxo, arquivo a arquivo (coortes maiores que a memória).
+        Parâmetros:
+            - paths (List): Lista de caminhos físicos dos arquivos.
+            - p (Dict): Parâmetros de thresholds.
+            - panels (List, opcional): Nomes dos painéis (padrão: apenas o painel padrão).
+            - progress (Callable, opcional): Recebe (tarefas concluídas, total) a cada resultado.
+        Entrada: Lista de caminhos, limites e painéis.
+        Saída: Iterator de (índice do arquivo, {painel: variantes qualificadas}), na ordem de conclusão.
+        Lógica: Cada tabela de iter_files vira um repositório de um arquivo, filtrado e descartado em seguida; a memória
+                do processo pai fica limitada aos arquivos em andamento, não à coorte.
+        '''
+        for i, table in self.iter_files(paths, progress): # Arquivos conforme ficam completos
+            store = table.add_column(0, 'FILE', pa.array(np.zeros(table.num_rows, np.int32))).to_pandas() # Um arquivo
+            yield i, {name: self.apply_thresholds(store, p, panel=name) for name in panels or [self.rules.default]}
+
+    @staticmethod
+    def sample_id(path: str) -> str:
+        '''Descrição: Identificador da amostra. Lógica: Nome do arquivo até o primeiro ponto.'''
+        return os.path.basename(path).split('.')[0] # Ex.: liftOver_WP048_hg19ToHg38
+
+    @profiled('risk.sample_risk')
+    def sample_risk(self, df: pd.DataFrame, paths: List[str]) -> pd.DataFrame:
+        '''
+        Descrição: Gera a tabela consolidada de risco por amostra (MAIOR_RISCO, TP53_PRESENTE, GENES, N_VARIANTES).
+        Parâmetros:
+            - df (pd.DataFrame): Variantes qualificadas (saída de apply_thresholds).
+            - paths (List): Arquivos da coorte (uma linha por arquivo, inclusive amostras WT).
+        Entrada: DataFrame de variantes e lista de caminhos.
+        Saída: pd.DataFrame com uma linha por arquivo, na ordem de paths.
+        Lógica: Agregações groupby únicas por SAMPLEID, reindexadas contra a coorte completa; aceita colunas category
+                (leitura colunar do VariantDataset).
+        '''
+        ids = [self.sample_id(p) for p in paths] # Amostras da coorte (ordem original)
+        by = df.groupby('SAMPLEID', sort=False, observed=True) # Agrupamento único por amostra
+        n = by.size().reindex(ids, fill_value=0).to_numpy() # Número de variantes por amostra
+        tp53 = df['GENE'].eq('TP53').groupby(df['SAMPLEID'], sort=False, observed=True).any() # TP53 por amostra
+        genes = df.drop_duplicates(['SAMPLEID', 'GENE']).groupby('SAMPLEID', sort=False, observed=True)['GENE'] # Únicos
+        return pd.DataFrame({'SAMPLEID': ids, 'MAIOR_RISCO': np.where(n > 0, 'SIM', 'NÃO'),
+                             'TP53_PRESENTE': np.where(tp53.reindex(ids, fill_value=False).to_numpy(), 'SIM', 'NÃO'),
+                             'GENES': genes.agg(', '.join).astype(object).reindex(ids, fill_value='').to_numpy(),
+                             'N_VARIANTES': n}) # Tabela consolidada
+
     def run_parallel(self, paths: List[str], p: Dict) -> List[Dict]:
         '''
         Descrição: Orquestra o processamento paralelo da coorte de arquivos VCF.
@@ -120,20 +731,24 @@ class VCFProcessor:
             - p (Dict): Parâmetros de filtragem.
         Entrada: Lista de strings e dicionário de thresholds.
         Saída: List[Dict] consolidada de toda a análise de coorte.
-        Lógica: Distribui a carga de processamento entre todos os cores lógicos via ProcessPoolExecutor.
+        Lógica: Executa as duas fases do motor (parsing colunar e filtragem vetorizada) em sequência.
         '''
-        with ProcessPoolExecutor() as executor: # Inicializa o pool de processos paralelo
-            tasks = [(f, p) for f in paths] # Cria a lista de tuplas de tarefas
-            results = list(executor.map(self.process_file_worker, tasks)) # Mapeia tarefas nos cores
-        return [item for sublist in results for item in sublist] # Achata a lista de listas em vetor único
+        return self.apply_thresholds(self.build_candidates(paths), p).to_dict('records') # Fases 1 e 2
 
     def process_file_worker(self, task: Tuple[str, Dict]) -> List[Dict]:
-        '''Descrição: Worker individual para leitura. Lógica: Itera sobre linhas ignorando header.'''
+        '''Descrição: Worker individual para leitura. Lógica: Fase 1 + fase 2 em Arrow, sem DataFrame por arquivo.'''
         path, p = task # Desempacota o caminho e os parâmetros
-        fields, final_res, sid = self.get_csq_fields(path), [], os.path.basename(path).split('.')[0] # Setup
-        if not fields: return [] # Cancela processamento se o arquivo não tiver CSQ
-        with open(path, 'r', encoding='utf-8') as f: # Abre o VCF para leitura
-            for line in f: # Varre cada linha de dados
-                if not line.startswith('#'): # Filtra linhas que não são de metadados
-                    final_res.extend(self.parse_line(line, fields, p, sid)) # Acumula variantes qualificadas
-        return final_res # Retorna o conjunto de variantes da amostra específica
\ No newline at end of file
+        table = self.process_file_candidates(path) # Parsing em passagem única
+        return self.filter_table(table, p).to_pylist() # Retorna o conjunto de variantes da amostra
+
+_WORKER = None # VCFProcessor de cada processo do pool (criado por _init_worker)
+
+def _init_worker(config: Dict, profile: bool = False):
+    '''Descrição: Inicializador do pool de processos. Lógica: Compila os painéis do processo pai uma vez por worker.'''
+    global _WORKER # Instância compartilhada pelas tarefas do processo
+    _WORKER = VCFProcessor(backend='serial', profiler=Profiler(profile), rules=RuleSet(config)) # Sem cache nem sub-pool
+
+def _candidates_task(path: str, span: Optional[Tuple[int, int]]) -> Tuple[pa.Table, Optional[Dict]]:
+    '''Descrição: Tarefa do pool de processos. Lógica: Fase 1 com o worker do processo + medições da tarefa (ou None).'''
+    table = _WORKER.process_file_candidates(path, span) # Tabela colunar da tarefa
+    return table, _WORKER.profiler.drain() # Medições viajam com o resultado
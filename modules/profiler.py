@@ -0,0 +1,167 @@
+import os, json, time, threading, functools # Relógios, exportação e exclusão mútua
+from contextlib import contextmanager, nullcontext # Spans ativos e span nulo (perfilamento desligado)
+from typing import Callable, Dict, Iterable, List, Optional # Importação de tipos para tipagem estática
+
+NULL_SPAN = nullcontext() # Contexto compartilhado devolvido quando o perfilamento está desligado
+
+class Profiler:
+    '''
+    Descrição: Instrumentação opcional por etapa (tempo de parede, tempo de CPU, contadores) do pipeline.
+    Lógica: Spans viram eventos no formato trace-event (Chrome/Perfetto); timers acumulados e contadores cobrem
+            o laço quente sem um evento por chamada. Desligado, todos os pontos de medição são no-ops.
+    '''
+
+    def __init__(self, enabled: bool = False):
+        '''
+        Descrição: Inicializa o coletor.
+        Parâmetros:
+            - enabled (bool): Liga a coleta (pode ser alterado em tempo de execução).
+        Entrada: Estado inicial.
+        Saída: Instância vazia.
+        Lógica: Eventos, timers e contadores protegidos por lock (backend de threads compartilha a instância).
+        '''
+        self.enabled, self._lock = enabled, threading.Lock() # Estado e exclusão mútua
+        self.reset() # Estruturas vazias
+
+    def reset(self):
+        '''Descrição: Descarta as medições. Lógica: Nova execução da coorte.'''
+        self.events, self.timers, self.counters = [], {}, {} # Spans, [chamadas, parede, CPU] e contagens
+
+    def span(self, name: str, **args):
+        '''
+        Descrição: Mede um bloco de código.
+        Parâmetros:
+            - name (str): Nome da etapa (ex.: 'phase1.file').
+            - args: Metadados do evento (arquivo, faixa...).
+        Entrada: Nome e metadados.
+        Saída: Context manager.
+        Lógica: Desligado, devolve um contexto nulo compartilhado (sem alocação nem relógio).
+        '''
+        return self._span(name, args) if self.enabled else NULL_SPAN # Medição ou no-op
+
+    @contextmanager
+    def _span(self, name: str, args: Dict):
+        '''Descrição: Span ativo. Lógica: Início em tempo de época (alinha processos) e duração por perf_counter.'''
+        ts, t0, c0 = time.time(), time.perf_counter(), time.thread_time() # Relógios de início
+        try: yield # Executa o bloco medido
+        finally: # Registra mesmo em caso de exceção
+            wall, cpu = time.perf_counter() - t0, time.thread_time() - c0 # Durações
+            with self._lock: # Registro protegido
+                self.events.append({'name': name, 'ts': ts, 'dur': wall, 'cpu': cpu, 'pid': os.getpid(),
+                                    'tid': threading.get_ident(), 'args': args}) # Evento trace
+                self._add(name, 1, wall, cpu) # Timer agregado
+
+    def _add(self, name: str, calls: int, wall: float, cpu: float):
+        '''Descrição: Acumula um timer. Lógica: Chamador mantém o lock.'''
+        t = self.timers.setdefault(name, [0, 0.0, 0.0]) # [chamadas, parede, CPU]
+        t[0] += calls; t[1] += wall; t[2] += cpu # Soma
+
+    def count(self, name: str, n: int = 1):
+        '''Descrição: Incrementa um contador. Lógica: No-op quando desligado.'''
+        if not self.enabled: return # Sem custo além do teste
+        with self._lock: self.counters[name] = self.counters.get(name, 0) + n # Soma protegida
+
+    def timed(self, name: str, fn: Callable) -> Callable:
+        '''
+        Descrição: Envolve uma função do laço quente num timer acumulado.
+        Parâmetros:
+            - name (str): Nome do timer.
+            - fn (Callable): Função a medir.
+        Entrada: Nome e função.
+        Saída: A própria função (desligado) ou um wrapper medido.
+        Lógica: Resolvido uma vez antes do laço; nenhum evento individual é criado.
+        '''
+        if not self.enabled: return fn # Zero overhead
+        def wrapper(*a, **k): # Mede cada chamada
+            t0, c0 = time.perf_counter(), time.thread_time() # Relógios
+            try: return fn(*a, **k) # Chamada original
+            finally:
+                with self._lock: self._add(name, 1, time.perf_counter() - t0, time.thread_time() - c0) # Acumula
+        return wrapper # Função instrumentada
+
+    def timed_iter(self, name: str, it: Iterable) -> Iterable:
+        '''Descrição: Mede o tempo gasto produzindo cada item (ex.: leitura de blocos). Lógica: Desligado, devolve it.'''
+        if not self.enabled: return it # Zero overhead
+        return self._timed_iter(name, iter(it)) # Iterador medido
+
+    def _timed_iter(self, name: str, it):
+        '''Descrição: Iterador medido. Lógica: Cronometra apenas o next() do iterador original.'''
+        while True: # Até o esgotamento
+            t0, c0 = time.perf_counter(), time.thread_time() # Relógios
+            try: item = next(it) # Produção do item (I/O, descompressão)
+            except StopIteration: return # Fim da iteração
+            finally:
+                with self._lock: self._add(name, 1, time.perf_counter() - t0, time.thread_time() - c0) # Acumula
+            yield item # Entrega ao consumidor (tempo dele não é contado)
+
+    def drain(self) -> Optional[Dict]:
+        '''Descrição: Exporta e zera as medições de um worker. Lógica: None quando desligado (nada a transferir).'''
+        if not self.enabled: return None # Nada coletado
+        with self._lock: # Cópia consistente
+            data = {'events': self.events, 'timers': self.timers, 'counters': self.counters, 'sent': time.time()}
+            self.reset() # Próxima tarefa começa vazia
+        return data # Pacote serializável
+
+    def merge(self, data: Optional[Dict], received: Optional[float] = None):
+        '''
+        Descrição: Incorpora as medições de um worker de processo.
+        Parâmetros:
+            - data (Dict): Pacote gerado por drain() no worker.
+            - received (float, opcional): time.time() em que o resultado chegou ao processo pai (padrão: agora).
+        Entrada: Pacote ou None e horário de chegada.
+        Saída: Nenhuma (modifica o coletor).
+        Lógica: Soma timers e contadores; o atraso entre envio e chegada é contabilizado como IPC. O horário de
+                chegada vem do callback do future, não do momento do merge (que espera o consumidor do resultado).
+        '''
+        if not data: return # Worker sem perfilamento
+        received = time.time() if received is None else received # Chegada ao processo pai
+        with self._lock: # Incorporação protegida
+            self.events.extend(data['events']) # Spans do worker (pid próprio)
+            for name, (calls, wall, cpu) in data['timers'].items(): self._add(name, calls, wall, cpu) # Timers
+            for name, n in data['counters'].items(): self.counters[name] = self.counters.get(name, 0) + n # Contadores
+            self._add('phase1.ipc', 1, max(0.0, received - data['sent']), 0.0) # Serialização + transporte
+
+    def summary(self) -> List[Dict]:
+        '''Descrição: Tabela por etapa. Lógica: Chamadas, parede e CPU totais, da etapa mais lenta para a mais rápida.'''
+        rows = [{'ETAPA': name, 'CHAMADAS': calls, 'PAREDE_S': round(wall, 4), 'CPU_S': round(cpu, 4)}
+                for name, (calls, wall, cpu) in self.timers.items()] # Uma linha por timer
+        return sorted(rows, key=lambda r: -r['PAREDE_S']) # Mais lentas primeiro
+
+    def per_file(self) -> List[Dict]:
+        '''Descrição: Tempos por arquivo/worker. Lógica: Spans 'phase1.file' com arquivo, faixa e pid.'''
+        return [{'ARQUIVO': os.path.basename(e['args'].get('file', '')), 'FAIXA': e['args'].get('span'),
+                 'PID': e['pid'], 'PAREDE_S': round(e['dur'], 4), 'CPU_S': round(e['cpu'], 4)}
+                for e in self.events if e['name'] == 'phase1.file'] # Um registro por tarefa
+
+    def to_json(self) -> str:
+        '''Descrição: Relatório completo. Lógica: Resumo por etapa, contadores e tempos por arquivo.'''
+        return json.dumps({'stages': self.summary(), 'counters': self.counters, 'files': self.per_file()}, indent=2,
+                          default=str)
+
+    def to_trace(self) -> str:
+        '''Descrição: Exportação trace-event. Lógica: Eventos completos ('X') em µs, abertos no Perfetto/chrome://tracing.'''
+        events = [{'name': e['name'], 'cat': e['name'].split('.')[0], 'ph': 'X', 'ts': round(e['ts'] * 1e6),
+                   'dur': round(e['dur'] * 1e6), 'pid': e['pid'], 'tid': e['tid'],
+                   'args': {**e['args'], 'cpu_ms': round(e['cpu'] * 1e3, 3)}} for e in self.events] # Spans
+        end = max((e['ts'] + e['dur'] for e in events), default=0) # Fim da execução
+        events += [{'name': k, 'ph': 'C', 'ts': end, 'pid': os.getpid(), 'args': {k: v}}
+                   for k, v in self.counters.items()] # Contadores
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, default=str) # Documento trace
+
+def profiled(name: str) -> Callable:
+    '''
+    Descrição: Decorador de métodos medidos pelo profiler da instância (atributo self.profiler).
+    Parâmetros:
+        - name (str): Nome da etapa.
+    Entrada: Nome.
+    Saída: Decorador.
+    Lógica: Sem profiler ou desligado, chama o método diretamente.
+    '''
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            prof = getattr(self, 'profiler', None) # Profiler injetado (opcional)
+            if prof is None or not prof.enabled: return fn(self, *args, **kwargs) # Caminho sem medição
+            with prof.span(name): return fn(self, *args, **kwargs) # Caminho medido
+        return wrapper
+    return decorator
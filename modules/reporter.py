@@ -1,5 +1,6 @@
 import io, pandas as pd  # Importação de bibliotecas para buffer de memória e estruturas de dados tabulares
 from fpdf import FPDF  # Importação da biblioteca FPDF para construção de documentos PDF
+from modules.profiler import profiled  # Instrumentação opcional por etapa
 
 class ReportManager:
     '''
@@ -7,20 +8,51 @@ class ReportManager:
     Lógica: Centraliza gráficos e insere blocos de texto que explicam a ciência por trás de cada visualização e seus resultados.
     '''
 
-    def _convert_fig_to_buffer(self, fig):
+    def __init__(self, profiler=None):
+        '''Descrição: Inicializa o gestor. Lógica: Profiler opcional mede rasterização e montagem do PDF.'''
+        self.profiler = profiler  # modules.profiler.Profiler ou None
+
+    @profiled('report.render_png')
+    def render_png(self, fig) -> bytes:
         '''
-        Descrição: Converte um objeto Figure do Matplotlib num buffer de imagem binária PNG.
+        Descrição: Rasteriza um objeto Figure do Matplotlib em bytes PNG.
         Parâmetros:
             - fig (matplotlib.figure.Figure): Instância do gráfico gerado.
         Tipo: Objeto de imagem Matplotlib.
         Entrada: Figure.
-        Saída: io.BytesIO contendo a imagem.
-        Lógica: Salva a figura no buffer com DPI 150 e reseta o ponteiro de leitura para o início.
+        Saída: bytes contendo a imagem PNG.
+        Lógica: Salva a figura com DPI 150; separado da montagem do PDF para permitir memoização dos PNGs.
         '''
         buffer = io.BytesIO()  # Inicializa o buffer de memória virtual
         fig.savefig(buffer, format='png', bbox_inches='tight', dpi=150)  # Salva a imagem como PNG otimizado
-        buffer.seek(0)  # Move o cursor de leitura para o início do buffer
-        return buffer  # Retorna o buffer pronto para inserção no PDF
+        return buffer.getvalue()  # Retorna os bytes da imagem
+
+    def render_pages(self, figs) -> list:
+        '''
+        Descrição: Rasteriza uma sequência de figuras (ex.: páginas do OncoPrint) e libera cada uma.
+        Parâmetros:
+            - figs (Iterable): Figures do Matplotlib (lista ou gerador).
+        Tipo: Sequência de objetos de imagem Matplotlib.
+        Entrada: Figures.
+        Saída: list de bytes PNG, na mesma ordem.
+        Lógica: Fecha cada figura após a rasterização; com um gerador, apenas uma página existe em memória por vez.
+        '''
+        import matplotlib.pyplot as plt  # Gestor de figuras (importado só quando há páginas a liberar)
+        pngs = []  # PNGs das páginas
+        for fig in figs: pngs.append(self.render_png(fig)); plt.close(fig)  # Rasteriza e libera
+        return pngs  # Páginas prontas para o PDF
+
+    def _convert_fig_to_buffer(self, fig):
+        '''
+        Descrição: Converte um objeto Figure do Matplotlib (ou PNG já rasterizado) num buffer de imagem binária PNG.
+        Parâmetros:
+            - fig (matplotlib.figure.Figure | bytes): Instância do gráfico gerado ou PNG de render_png.
+        Tipo: Objeto de imagem Matplotlib ou bytes.
+        Entrada: Figure ou bytes.
+        Saída: io.BytesIO contendo a imagem.
+        Lógica: Reutiliza o PNG recebido ou rasteriza a figura, com o cursor de leitura no início do buffer.
+        '''
+        return io.BytesIO(fig if isinstance(fig, (bytes, bytearray)) else self.render_png(fig))  # Buffer pronto para o PDF
 
     def _draw_table(self, pdf, df):
         '''
@@ -47,12 +79,13 @@ class ReportManager:
             pdf.cell(col_w, 6, str(row['TP53_PRESENTE']), 1, 0, 'C')  # Célula Status TP53
             pdf.cell(col_w, 6, str(row.get('N_VARIANTES', 0)), 1, 1, 'C')  # Célula Contagem final
 
+    @profiled('report.create_pdf')
     def create_cohort_report(self, p: dict, figs: dict, summary: str, df_risk: pd.DataFrame) -> bytes:
         '''
         Descrição: Orquestra a criação do reporter completo com textos explicativos de resultado e centralização.
         Parâmetros:
             - p (dict): Thresholds de filtragem técnica.
-            - figs (dict): Dicionário de objetos Figure.
+            - figs (dict): Dicionário de objetos Figure (ou PNGs já rasterizados); 'onco' aceita lista de páginas.
             - summary (str): Texto de resumo executivo.
             - df_risk (pd.DataFrame): Tabela de classificação de risco.
         Tipo: Dict, Dict, String e DataFrame.
@@ -109,7 +142,10 @@ class ReportManager:
         pdf.set_font("Helvetica", '', 9)  # Fonte descrição
         desc_onco = "O OncoPrint visualiza a co-ocorrência de mutações entre amostras. O resultado permite identificar se certas mutações ocorrem simultaneamente (co-ocorrência) ou se são mutuamente exclusivas, auxiliando na compreensão da arquitetura clonal da coorte."  # Explicação
         pdf.multi_cell(0, 5, desc_onco)  # Texto explicativo
-        pdf.image(self._convert_fig_to_buffer(figs['onco']), x=15, w=180)  # OncoPrint centralizado
+        pages = figs['onco'] if isinstance(figs['onco'], list) else [figs['onco']]  # Figura única ou paginada
+        for i, page in enumerate(pages):  # Páginas do OncoPrint (ordem global preservada)
+            if i: pdf.add_page()  # Cada fatia de amostras numa página própria
+            pdf.image(self._convert_fig_to_buffer(page), x=15, w=180)  # OncoPrint centralizado
         
         pdf.ln(10)  # Espaçamento
         pdf.set_font("Helvetica", 'B', 11); pdf.cell(0, 10, "5. ASSINATURAS DE SUBSTITUIÇÃO SNV", ln=True)  # Cabeçalho 5
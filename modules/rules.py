@@ -0,0 +1,107 @@
+import os, re, sys, json # Leitura da configuração, matcher compilado e internação de strings
+from typing import Dict, Optional # Importação de tipos para tipagem estática
+
+DEFAULT_IMPACTS = ['HIGH', 'MODERATE'] # Severidades VEP aceitas quando o painel não define as suas
+DEFAULT_PANELS = { # Painel original (usado quando não há arquivo de configuração)
+    'default': 'mf_high_risk',
+    'panels': {'mf_high_risk': {
+        'label': 'MF alto risco', 'genes': ['TP53', 'EZH2', 'CBL', 'U2AF1', 'SRSF2', 'IDH1', 'IDH2', 'NRAS', 'KRAS'],
+        'consequences': ['missense_variant', 'stop_gained', 'frameshift_variant', 'splice_', 'start_lost'],
+        'impacts': DEFAULT_IMPACTS}}}
+MAX_TERMS = 32 # Bits disponíveis em CONS_MASK (uint32)
+
+class Panel:
+    '''
+    Descrição: Painel de genes compilado (genes, severidades e termos de consequência).
+    Lógica: Conjuntos imutáveis de strings internadas e um único regex de consequência, montados uma vez.
+    '''
+
+    def __init__(self, name: str, spec: Dict, term_bits: Dict[str, int]):
+        '''
+        Descrição: Compila a especificação de um painel.
+        Parâmetros:
+            - name (str): Identificador do painel.
+            - spec (Dict): Entrada do arquivo de configuração (label, genes, consequences, impacts).
+            - term_bits (Dict): Termo de consequência -> bit em CONS_MASK (compartilhado entre painéis).
+        Entrada: Nome, especificação e mapa de bits.
+        Saída: Instância compilada.
+        Lógica: O regex de alternação equivale a any(c in consequence for c in terms).
+        '''
+        self.name, self.label = name, spec.get('label', name) # Identificação
+        self.genes = frozenset(sys.intern(g) for g in spec['genes']) # Painel de genes
+        self.impacts = frozenset(sys.intern(i) for i in spec.get('impacts', DEFAULT_IMPACTS)) # Severidades aceitas
+        self.terms = tuple(spec.get('consequences', [])) # Termos funcionais (substrings do Consequence)
+        self.matcher = re.compile('|'.join(map(re.escape, self.terms))) if self.terms else None # Matcher único
+        self.cons_bits = sum(1 << term_bits[t] for t in self.terms) # Bits do painel em CONS_MASK
+
+    def accepts(self, gene: Optional[str], impact: Optional[str], cons: str) -> bool:
+        '''Descrição: Regra biológica de um transcrito. Lógica: Gene do painel E (impacto aceito OU termo funcional).'''
+        return gene in self.genes and (impact in self.impacts or bool(self.matcher and self.matcher.search(cons)))
+
+class RuleSet:
+    '''
+    Descrição: Conjunto de painéis nomeados carregado de arquivo (ex.: MF alto risco, apenas TP53, mieloide estendido).
+    Lógica: A fase 1 extrai a união dos genes de todos os painéis com uma máscara de termos comum; cada painel
+            vira apenas uma máscara vetorizada na fase 2, permitindo avaliar vários painéis numa única passagem.
+    '''
+
+    def __init__(self, config: Dict):
+        '''
+        Descrição: Compila todos os painéis da configuração.
+        Parâmetros:
+            - config (Dict): Estrutura {'default': nome, 'panels': {nome: especificação}}; cada especificação pode
+              trazer 'regions' ({gene: [cromossomo, início, fim]}) para genes fora de PANEL_REGIONS.
+        Entrada: Configuração já carregada.
+        Saída: Instância compilada.
+        Lógica: União ordenada de genes e termos (ordem estável = chave de cache estável); valida o limite de bits.
+        '''
+        if not config.get('panels'): raise ValueError("Configuração de painéis vazia") # Nada a avaliar
+        self.config = config # Forma serializável (repassada aos workers de processo)
+        specs = config['panels'] # Especificações por nome
+        self.genes = list(dict.fromkeys(g for s in specs.values() for g in s['genes'])) # União dos genes
+        self.cons = list(dict.fromkeys(t for s in specs.values() for t in s.get('consequences', []))) # União dos termos
+        if len(self.cons) > MAX_TERMS: raise ValueError(f"Máximo de {MAX_TERMS} termos de consequência por configuração")
+        bits = {t: i for i, t in enumerate(self.cons)} # Termo -> bit
+        self.panels = {name: Panel(name, spec, bits) for name, spec in specs.items()} # Painéis compilados
+        self.default = config.get('default') or next(iter(self.panels)) # Painel padrão
+        if self.default not in self.panels: raise ValueError(f"Painel padrão inexistente: {self.default}")
+        self.gene_set = frozenset(sys.intern(g) for g in self.genes) # Filtro da fase 1
+        self.regions = {g: tuple(r) for s in specs.values() for g, r in s.get('regions', {}).items()} # hg38 extras
+        self._masks = {} # Consequence -> CONS_MASK (poucas combinações distintas por coorte)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'RuleSet':
+        '''
+        Descrição: Carrega os painéis do arquivo de configuração.
+        Parâmetros:
+            - path (str, opcional): Arquivo JSON (padrão: variável PANELS_FILE ou ./config/panels.json).
+        Entrada: Caminho opcional.
+        Saída: RuleSet compilado.
+        Lógica: Só o caminho padrão ausente usa o painel MF original embutido; um arquivo indicado explicitamente
+                (parâmetro ou PANELS_FILE) e inexistente gera FileNotFoundError, nunca um painel trocado em silêncio.
+        '''
+        explicit = path or os.getenv('PANELS_FILE') # Arquivo escolhido pelo chamador
+        path = explicit or './config/panels.json' # Resolve o arquivo
+        if not os.path.exists(path): # Arquivo ausente
+            if explicit: raise FileNotFoundError(f"Configuração de painéis não encontrada: {path}") # Erro do usuário
+            return cls(DEFAULT_PANELS) # Painel embutido
+        with open(path, encoding='utf-8') as f: return cls(json.load(f)) # Painéis configurados
+
+    def panel(self, name: Optional[str] = None) -> Panel:
+        '''Descrição: Painel por nome. Lógica: None devolve o painel padrão; nome inválido gera KeyError explícito.'''
+        if name is None: return self.panels[self.default] # Painel padrão
+        if name not in self.panels: raise KeyError(f"Painel desconhecido: {name} (use {', '.join(self.panels)})")
+        return self.panels[name] # Painel solicitado
+
+    def cons_mask(self, cons: str) -> int:
+        '''
+        Descrição: Máscara de termos funcionais de uma string Consequence.
+        Parâmetros:
+            - cons (str): Campo Consequence do transcrito (termos separados por '&').
+        Entrada: String.
+        Saída: int com um bit por termo presente (ordem de self.cons).
+        Lógica: Memoizada por string; o cálculo por substring ocorre uma vez por combinação distinta.
+        '''
+        mask = self._masks.get(cons) # Combinação já vista
+        if mask is None: mask = self._masks[cons] = sum(1 << i for i, t in enumerate(self.cons) if t in cons) # Calcula
+        return mask # Bits dos termos presentes
@@ -2,6 +2,17 @@ import matplotlib.pyplot as plt # Importação do núcleo de plotagem Matplotlib
 import seaborn as sns # Importação do Seaborn para estilização estatística
 import pandas as pd # Manipulação de estruturas de dados
 import os # Operações de sistema de arquivos
+from typing import Iterator, Optional # Importação de tipos para tipagem estática
+from matplotlib.colors import ListedColormap # Paleta discreta do OncoPrint (código -> cor)
+from matplotlib.patches import Patch # Legenda dos tipos de consequência
+from modules.profiler import profiled # Instrumentação opcional por etapa
+from modules.oncoprint import OncoMatrix # Matriz gene x amostra em códigos inteiros
+
+PLOT_COLUMNS = ['SAMPLEID', 'GENE', 'TYPE', 'SUB'] # Únicas colunas lidas pelos gráficos (leitura colunar seletiva)
+ONCO_COLORS = ['#6c5ce7', '#e17055', '#00b894', '#fdcb6e', '#0984e3', '#d63031', '#636e72', '#e84393'] # Tipos
+ONCO_INCH = 0.12 # Largura por coluna de amostra (polegadas)
+ONCO_MAX_COLS = int(os.getenv('ONCO_MAX_COLS', 240)) # Colunas exibidas antes de agrupar amostras (tela)
+ONCO_PAGE_SAMPLES = int(os.getenv('ONCO_PAGE_SAMPLES', 150)) # Amostras por página no PDF (0 = página única agrupada)
 
 class BioVisualizer:
     '''
@@ -9,6 +20,11 @@ class BioVisualizer:
     Lógica: Transforma DataFrames filtrados em representações gráficas interpretáveis.
     '''
 
+    def __init__(self, profiler=None):
+        '''Descrição: Inicializa o gerador. Lógica: Profiler opcional mede a renderização de cada gráfico.'''
+        self.profiler = profiler # modules.profiler.Profiler ou None
+
+    @profiled('viz.gene_frequency')
     def plot_gene_frequency(self, df: pd.DataFrame):
         '''Descrição: Gráfico de barras de prevalência. Lógica: Countplot ordenado por incidência.'''
         if df.empty: return None # Proteção contra execução com dados nulos
@@ -17,15 +33,70 @@ class BioVisualizer:
         plt.title("Prevalência Mutacional por Gene (Coorte)", fontweight='bold') # Adiciona título
         return fig # Retorna objeto Figure para renderização no App
 
-    def plot_oncoprint(self, df: pd.DataFrame):
-        '''Descrição: Matriz de Co-ocorrência. Lógica: Heatmap binário em dados pivotados.'''
+    @profiled('viz.oncoprint')
+    def plot_oncoprint(self, df: pd.DataFrame, cohort_size: Optional[int] = None, max_cols: int = ONCO_MAX_COLS):
+        '''
+        Descrição: Matriz de Co-ocorrência (OncoPrint) da coorte inteira numa única figura.
+        Parâmetros:
+            - df (pd.DataFrame): Variantes qualificadas.
+            - cohort_size (int, opcional): Amostras da coorte, inclusive selvagens (denominador da frequência por gene).
+            - max_cols (int): Colunas máximas; coortes maiores agrupam amostras adjacentes.
+        Entrada: DataFrame.
+        Saída: Figure ou None (sem dados).
+        Lógica: Matriz de códigos inteiros ordenada por exclusividade mútua, rasterizada com imshow.
+        '''
         if df.empty: return None # Proteção contra execução com dados nulos
-        mtx = df.pivot_table(index='GENE', columns='SAMPLEID', values='TYPE', aggfunc='first').fillna('WT') # Pivot
-        fig, ax = plt.subplots(figsize=(12, len(mtx)*0.4 + 2)) # Ajusta altura dinâmica conforme nº de genes
-        sns.heatmap(mtx.applymap(lambda x: x != 'WT'), cmap=['#f2f2f2', '#6c5ce7'], cbar=False, ax=ax) # Plot
-        plt.title("OncoPrint: Paisagem da Coorte", fontweight='bold') # Adiciona título
+        mtx = OncoMatrix.from_frame(df).sort() # Matriz ordenada
+        return self._draw_oncoprint(mtx.downsample(max_cols), mtx.frequencies(cohort_size), "OncoPrint: Paisagem da Coorte")
+
+    def plot_oncoprint_pages(self, df: pd.DataFrame, cohort_size: Optional[int] = None,
+                             per_page: int = ONCO_PAGE_SAMPLES) -> Iterator:
+        '''
+        Descrição: OncoPrint paginado para o PDF.
+        Parâmetros:
+            - df (pd.DataFrame): Variantes qualificadas.
+            - cohort_size (int, opcional): Amostras da coorte, inclusive selvagens (denominador da frequência por gene).
+            - per_page (int): Amostras por página (0 = página única com amostras agrupadas).
+        Entrada: DataFrame.
+        Saída: Iterator[Figure] (vazio sem dados).
+        Lógica: Uma ordenação global; as páginas são fatias consecutivas (escada contínua entre páginas), desenhadas
+                sob demanda para que o consumidor rasterize e feche uma figura por vez.
+        '''
+        if df.empty: return # Proteção contra execução com dados nulos
+        mtx = OncoMatrix.from_frame(df).sort() # Matriz ordenada
+        freq, title = mtx.frequencies(cohort_size), "OncoPrint: Paisagem da Coorte" # Rótulos comuns às páginas
+        if not per_page or per_page <= 0: yield self._draw_oncoprint(mtx.downsample(ONCO_MAX_COLS), freq, title); return
+        n = -(-len(mtx.samples) // per_page) # Número de páginas
+        for i, page in enumerate(mtx.pages(per_page), 1): yield self._draw_oncoprint(page, freq, f"{title} ({i}/{n})")
+
+    @profiled('viz.oncoprint_page')
+    def _draw_oncoprint(self, mtx: OncoMatrix, freq, title: str):
+        '''
+        Descrição: Desenha uma OncoMatrix.
+        Parâmetros:
+            - mtx (OncoMatrix): Matriz (já ordenada, agrupada ou paginada).
+            - freq (np.ndarray): Frequência de cada gene na coorte inteira, selvagens inclusive (rótulo das linhas).
+            - title (str): Título da figura.
+        Entrada: Matriz, frequências e título.
+        Saída: Figure.
+        Lógica: Uma única imagem (imshow) com paleta discreta; largura proporcional ao número de colunas e
+                rótulos de amostra apenas quando legíveis.
+        '''
+        n_genes, n_cols = mtx.codes.shape # Dimensões
+        cmap = ListedColormap(['#f2f2f2'] + [ONCO_COLORS[i % len(ONCO_COLORS)] for i in range(len(mtx.types))]) # Cores
+        fig, ax = plt.subplots(figsize=(min(max(8, 2 + n_cols * ONCO_INCH), 2 + ONCO_MAX_COLS * ONCO_INCH),
+                                        n_genes * 0.4 + 2)) # Largura conforme o nº de amostras, altura conforme genes
+        ax.imshow(mtx.codes, cmap=cmap, vmin=0, vmax=len(mtx.types), aspect='auto', interpolation='nearest') # Raster
+        ax.set_yticks(range(n_genes)); ax.set_yticklabels([f"{g} ({f:.0%})" for g, f in zip(mtx.genes, freq)]) # Genes
+        if n_cols <= 60: ax.set_xticks(range(n_cols)); ax.set_xticklabels(mtx.samples, rotation=90, fontsize=7) # Amostras
+        else: ax.set_xticks([]) # Rótulos ilegíveis em coortes grandes
+        ax.set_xlabel(f"Amostras ({n_cols} colunas" + (f", {mtx.bin_size} amostras por coluna)" if mtx.bin_size > 1 else ")"))
+        ax.legend(handles=[Patch(color=cmap(i + 1), label=t) for i, t in enumerate(mtx.types)], loc='upper left',
+                  bbox_to_anchor=(1.01, 1), fontsize=7, frameon=False) # Legenda dos tipos
+        ax.set_title(title, fontweight='bold') # Adiciona título
         return fig # Retorna objeto Figure
 
+    @profiled('viz.signatures')
     def plot_signatures(self, df: pd.DataFrame):
         '''Descrição: Perfil de Substituição de Bases. Lógica: Countplot SNV em ordem biológica.'''
         if df.empty: return None # Proteção contra execução com dados nulos
@@ -35,6 +106,7 @@ class BioVisualizer:
         plt.title("Assinaturas: Perfil de Substituição SNV", fontweight='bold') # Título
         return fig # Retorna objeto Figure
 
+    @profiled('viz.risk_pie')
     def plot_risk_pie(self, df: pd.DataFrame, files: list):
         '''Descrição: Proporção de risco global. Lógica: Compara IDs mutados vs IDs totais.'''
         mutated_ids = set(df['SAMPLEID'].unique()) # IDs que possuem pelo menos uma variante de risco